@@ -0,0 +1,168 @@
+import re
+from collections import Counter
+
+
+# ---------- INPUT SIGNALS ----------
+AFFIRMATIVE_RE = re.compile(
+    r"^\s*(?:yes|yeah|yep|yup|sure|definitely|sometimes|often|always|a lot|it does|i do)\b"
+)
+
+# Duration choices offered by the Diagnosis page, and which of them
+# (with severity >= SEVERE) escalate a low or unclear risk to medium
+DURATION_OPTIONS = ("Less than 24 hours", "1–3 days", "4–7 days", "More than a week")
+DURATION_LEVELS = dict(zip(DURATION_OPTIONS, (0, 0, 1, 1)))
+SEVERE = 8
+
+# Each affirmative follow-up answer adds this much to its condition's score
+CONFIRMATION_WEIGHT = 0.5
+
+
+class AssessmentState:
+    """
+    Incremental assessment for one set of symptoms.
+
+    The initial pass finds the symptom terms and scores every condition
+    that shares a term with them (partial coverage included). After that:
+
+    - answer() re-reads only the changed answer; conditions are rescored
+      only if they mention a term that appeared or disappeared, or own
+      the question that was answered
+    - set_duration() / set_severity() only move the risk escalation
+
+    result() is cached until one of these changes something.
+    """
+
+    def __init__(self, engine, symptoms: str, profile: dict = None):
+        self.engine = engine
+        self.profile = profile or {}
+
+        # Only the current symptoms are matched; past diagnoses from the
+        # history profile feed the advice, never the rule terms
+        found = engine.find_terms(symptoms)
+        self._term_counts = Counter(found)
+        self._found = set(found)
+
+        self._coverage = {}  # rule position -> fraction of groups satisfied
+        self._confirmations = Counter()  # rule position -> affirmative answers
+        self._answers = {}  # question -> (text, term ids, affirmative)
+        self._rescore(engine.rules_for(found))
+
+        self.duration = None
+        self.severity = None
+        self._result = None
+        self._winner = None
+
+        # Follow-up questions are fixed by the initial assessment
+        self.questions = self.result()["questions"]
+        self._question_rules = dict.fromkeys(self.questions, self._winner)
+
+    # ---------- UPDATES ----------
+    def _rescore(self, positions):
+        for position in positions:
+            coverage = self.engine.coverage(position, self._found)
+            if coverage:
+                self._coverage[position] = coverage
+            else:
+                self._coverage.pop(position, None)
+
+    def answer(self, question: str, text: str):
+        text = (text or "").strip()
+        old_text, old_terms, old_yes = self._answers.get(question, ("", frozenset(), False))
+        if text == old_text:
+            return
+
+        terms = frozenset(self.engine.find_terms(text)) if text else frozenset()
+        yes = bool(AFFIRMATIVE_RE.match(text.lower()))
+        self._answers[question] = (text, terms, yes)
+
+        # Only terms whose presence flips can change any rule's coverage
+        flipped = set()
+        for term_id in old_terms - terms:
+            self._term_counts[term_id] -= 1
+            if not self._term_counts[term_id]:
+                del self._term_counts[term_id]
+                self._found.discard(term_id)
+                flipped.add(term_id)
+        for term_id in terms - old_terms:
+            if not self._term_counts[term_id]:
+                self._found.add(term_id)
+                flipped.add(term_id)
+            self._term_counts[term_id] += 1
+        self._rescore(self.engine.rules_for(flipped))
+
+        owner = self._question_rules.get(question)
+        if owner is not None and yes != old_yes:
+            self._confirmations[owner] += 1 if yes else -1
+
+        self._result = None
+
+    def set_duration(self, duration: str):
+        if duration is not None and duration not in DURATION_LEVELS:
+            raise ValueError(f"unknown duration {duration!r}; expected one of {DURATION_OPTIONS}")
+        if duration != self.duration:
+            self.duration = duration
+            self._result = None
+
+    def set_severity(self, severity: int):
+        if severity != self.severity:
+            self.severity = severity
+            self._result = None
+
+    # ---------- RESULT ----------
+    def score(self, position: int) -> float:
+        return self._coverage.get(position, 0.0) + CONFIRMATION_WEIGHT * self._confirmations[position]
+
+    def ranked(self) -> list:
+        """[(condition, score)] for every partially matched condition, best first."""
+        positions = sorted(self._coverage, key=lambda p: (-self.score(p), p))
+        return [(self.engine.payload(p)["condition"], self.score(p)) for p in positions]
+
+    def escalation(self) -> int:
+        level = DURATION_LEVELS.get(self.duration, 0)
+        if self.severity is not None and self.severity >= SEVERE:
+            level = max(level, 1)
+        return level
+
+    def result(self) -> dict:
+        """{condition, questions, risk, advice}, as the Diagnosis page renders it."""
+        if self._result is not None:
+            return self._result
+
+        # Fired rules: every required group present. Higher risk wins;
+        # within a risk level, the better-confirmed condition wins.
+        fired = [p for p, coverage in self._coverage.items() if coverage >= 1]
+        if fired:
+            self._winner = min(fired, key=lambda p: (self.engine.rank(p), -self.score(p), p))
+            rule = self.engine.payload(self._winner)
+        else:
+            self._winner = None
+            rule = self.engine.fallback
+
+        result = {
+            "condition": rule["condition"],
+            "questions": list(rule["questions"]),
+            "risk": rule["risk"],
+            "advice": list(rule["advice"]),
+        }
+
+        if self.escalation() and result["risk"] in ("unknown", "low"):
+            result["risk"] = "medium"
+            if DURATION_LEVELS.get(self.duration, 0):
+                result["advice"].append("See a doctor if symptoms have lasted more than a few days")
+            if self.severity is not None and self.severity >= SEVERE:
+                result["advice"].append("Severe symptoms deserve a medical check soon")
+
+        if self.profile.get("conditions"):
+            names = ", ".join(c["name"] for c in self.profile["conditions"])
+            result["advice"].append(f"Tell the clinician about your history of {names}")
+        if self.profile.get("allergies"):
+            result["advice"].append(
+                f"Mention your allergies ({', '.join(self.profile['allergies'])}) before taking anything new"
+            )
+        if self.profile.get("medications"):
+            result["advice"].append(
+                f"Check new medicines against what you already take ({', '.join(self.profile['medications'])})"
+            )
+
+        self._result = result
+        return result
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import weakref
+
+
+# ---------- REQUEST ----------
+class ReplyRequest:
+    """What a backend gets for one turn: the message plus the agent's analysis."""
+
+    __slots__ = ("text", "mood", "urgency", "keywords", "signals", "history")
+
+    def __init__(self, text: str, mood: str, urgency: str, keywords: list,
+                 signals: dict, history: tuple = ()):
+        self.text = text
+        self.mood = mood
+        self.urgency = urgency
+        self.keywords = keywords
+        self.signals = signals
+        # Recent user messages, oldest first (for model backends)
+        self.history = history
+
+
+# ---------- BACKENDS ----------
+class ReplyBackend:
+    """
+    Interface for reply_async() backends.
+
+    generate() returns the full response text. Backends marked `local`
+    run inline on the event loop; all others go through the per-loop
+    concurrency limit, the timeout and in-flight request coalescing.
+    """
+
+    local = False
+
+    async def generate(self, agent, request: ReplyRequest) -> str:
+        raise NotImplementedError
+
+    def request_key(self, request: ReplyRequest):
+        """Requests with equal keys share one in-flight backend call."""
+        return (
+            request.text, request.mood, request.urgency, tuple(request.keywords),
+            tuple(sorted(request.signals.items())), request.history,
+        )
+
+
+class RuleEngineBackend(ReplyBackend):
+    """The built-in template engine (same output as reply())."""
+
+    local = True
+
+    async def generate(self, agent, request: ReplyRequest) -> str:
+        return " ".join(agent.response_segments(
+            request.text, request.mood, request.urgency, request.keywords, request.signals
+        ))
+
+
+class StubBackend(ReplyBackend):
+    """
+    Canned-response backend for tests and load runs; no network.
+    `reply` may be a string or a callable taking the ReplyRequest.
+    """
+
+    def __init__(self, reply="Thanks for sharing that with me.", delay: float = 0.0,
+                 error: Exception = None):
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def generate(self, agent, request: ReplyRequest) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.reply(request) if callable(self.reply) else self.reply
+
+
+class OpenAIBackend(ReplyBackend):
+    """Chat-completions backend; reads OPENAI_API_KEY from the environment."""
+
+    SYSTEM_PROMPT = (
+        "You are a warm, supportive personal health coach. You never diagnose, "
+        "never suggest medication, and you encourage professional help when "
+        "distress is intense or persistent. Reply in a few short, friendly sentences."
+    )
+
+    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None, max_tokens: int = 220,
+                 timeout: float = 30.0):
+        from openai import AsyncOpenAI
+
+        # The client's own default (600 s) would let a hung request hold
+        # a concurrency slot long after every caller has given up
+        self.client = AsyncOpenAI(
+            api_key=api_key or os.environ.get("OPENAI_API_KEY"), timeout=timeout, max_retries=0
+        )
+        self.model = model
+        self.max_tokens = max_tokens
+
+    async def generate(self, agent, request: ReplyRequest) -> str:
+        analysis = (
+            f"Detected mood: {request.mood}. Urgency: {request.urgency}. "
+            f"Key topics: {', '.join(request.keywords) or 'none'}."
+        )
+        messages = [{"role": "system", "content": self.SYSTEM_PROMPT + " " + analysis}]
+        messages += [{"role": "user", "content": t} for t in request.history]
+        messages.append({"role": "user", "content": request.text})
+
+        completion = await self.client.chat.completions.create(
+            model=self.model, messages=messages, max_tokens=self.max_tokens
+        )
+        return completion.choices[0].message.content.strip()
+
+
+RULE_ENGINE = RuleEngineBackend()
+
+
+# ---------- CONCURRENCY / COALESCING ----------
+MAX_CONCURRENT_CALLS = 16
+
+# Per event loop: semaphore and in-flight calls (asyncio primitives are
+# bound to the loop they are first used on). The service runs one loop,
+# so there the limit covers the whole process; code that drives
+# reply_async() from several loops gets MAX_CONCURRENT_CALLS per loop.
+_semaphores = weakref.WeakKeyDictionary()
+_in_flight = weakref.WeakKeyDictionary()
+
+
+def set_concurrency_limit(limit: int):
+    """Cap on simultaneous non-local backend calls per event loop."""
+    global MAX_CONCURRENT_CALLS
+    MAX_CONCURRENT_CALLS = limit
+    _semaphores.clear()
+
+
+async def _limited(backend: ReplyBackend, agent, request: ReplyRequest) -> str:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+    async with semaphore:
+        return await backend.generate(agent, request)
+
+
+def _finish(calls: dict, key, task):
+    entry = calls.get(key)
+    if entry is not None and entry[0] is task:
+        del calls[key]
+    # Every waiter may have timed out already; mark the error as retrieved
+    # (callers that are still waiting see and log it themselves)
+    if not task.cancelled():
+        task.exception()
+
+
+async def call_backend(backend: ReplyBackend, agent, request: ReplyRequest, timeout: float) -> str:
+    """
+    Run backend.generate under the concurrency limit and timeout. Identical
+    requests already in flight are awaited instead of issued again; a
+    caller timing out does not cancel the shared call for the others, but
+    the call is cancelled (freeing its slot) once its last caller leaves.
+    """
+    if backend.local:
+        return await backend.generate(agent, request)
+
+    loop = asyncio.get_running_loop()
+    calls = _in_flight.setdefault(loop, {})
+    key = (id(backend), backend.request_key(request))
+
+    entry = calls.get(key)  # [task, callers waiting on it]
+    if entry is None:
+        task = loop.create_task(_limited(backend, agent, request))
+        entry = calls[key] = [task, 0]
+        task.add_done_callback(lambda t: _finish(calls, key, t))
+    task = entry[0]
+
+    entry[1] += 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    finally:
+        entry[1] -= 1
+        if not entry[1] and not task.done():
+            # Nobody wants the answer any more; a new caller starts afresh
+            if calls.get(key) is entry:
+                del calls[key]
+            task.cancel()
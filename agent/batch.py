@@ -0,0 +1,99 @@
+import numpy as np
+
+from agent.coach_agent import FIRST_PERSON
+from agent.features import TextFeatures
+from agent.lexicon import LEXICON
+from agent.patterns import PATTERNS
+
+
+# ---------- FEATURE MATRIX LAYOUT ----------
+# Boolean pattern families (detect_mood only asks "does any pattern match")
+FLAG_COLUMNS = (
+    "explicit_intent", "passive_death", "hopelessness", "self_worth",
+    "sad", "stress", "happy", "positive_phrase", "connection", "wellbeing",
+)
+# Pattern families scored per distinct match (detect_urgency)
+COUNT_COLUMNS = ("urgency_high_risk", "urgency_immediacy")
+# Token-level urgency signals
+SIGNAL_COLUMNS = ("first_person", "exclamations", "shouting")
+
+COLUMNS = FLAG_COLUMNS + COUNT_COLUMNS + LEXICON.categories + SIGNAL_COLUMNS
+COLUMN_INDEX = {name: i for i, name in enumerate(COLUMNS)}
+
+MOOD_LABELS = np.array(["crisis", "sad", "stress", "neutral", "happy"])
+URGENCY_LABELS = np.array(["crisis", "high", "medium", "normal"])
+
+
+def feature_row(features: TextFeatures, patterns=PATTERNS) -> list:
+    """One matrix row with every signal detect_mood/detect_urgency score on."""
+    text = features.text
+    row = [1 if patterns[name].search(text) else 0 for name in FLAG_COLUMNS]
+    row.extend(patterns[name].count(text) for name in COUNT_COLUMNS)
+    row.extend(features.hits[name] for name in LEXICON.categories)
+    row.append(1 if any(fp in features.tokens for fp in FIRST_PERSON) else 0)
+    row.append(1 if text.count("!") >= 2 else 0)
+    row.append(1 if any(w.isupper() and len(w) > 3 for w in features.tokens) else 0)
+    return row
+
+
+def feature_matrix(features_list: list, patterns=PATTERNS) -> np.ndarray:
+    rows = [feature_row(features, patterns) for features in features_list]
+    return np.array(rows, dtype=np.int32).reshape(len(rows), len(COLUMNS))
+
+
+# ---------- VECTORIZED SCORING ----------
+def score_moods(matrix: np.ndarray) -> np.ndarray:
+    """Vectorized detect_mood: same thresholds, same precedence."""
+    col = lambda name: matrix[:, COLUMN_INDEX[name]]
+
+    score = (
+        5 * col("explicit_intent")
+        + 4 * col("passive_death")
+        + 3 * col("hopelessness")
+        + 2 * col("self_worth")
+        + col("pain_intensity")
+        + col("mood_immediacy")
+        - (col("protective") > 0)
+    )
+
+    happy = (
+        (col("happy") + col("positive_phrase") + col("connection") + col("wellbeing") > 0)
+        | ((col("low_positive") >= 2) & (col("strong_negative") == 0))
+    )
+
+    # Philosophical fallback
+    pos, neg = col("positive"), col("negative")
+    helpless = col("helpless")
+
+    conditions = [
+        score >= 6,
+        col("sad") > 0,
+        col("stress") > 0,
+        happy,
+        (col("nihilism") > 0) & (neg > 0),
+        (col("meaning") > 0) & (neg > 0),
+        (col("control") > helpless) & (pos >= neg),
+        (helpless > 0) & ((col("absolutist") > 0) | (col("self_blame") > 0)),
+        (pos > 0) & (neg > 0),
+        (pos > neg) & (pos > 0),
+        (neg > pos) & (neg > 0),
+    ]
+    codes = [0, 1, 2, 4, 1, 2, 4, 2, 2, 4, 1]
+    return MOOD_LABELS[np.select(conditions, codes, default=3)]
+
+
+def score_urgencies(matrix: np.ndarray) -> np.ndarray:
+    """Vectorized detect_urgency."""
+    col = lambda name: matrix[:, COLUMN_INDEX[name]]
+
+    score = (
+        5 * col("urgency_high_risk")
+        + 3 * col("urgency_immediacy")
+        + 2 * col("overload")
+        + 2 * col("hopeless")
+        + col("first_person")
+        + col("exclamations")
+        + col("shouting")
+    )
+    conditions = [score >= 7, score >= 4, score >= 2]
+    return URGENCY_LABELS[np.select(conditions, [0, 1, 2], default=3)]
@@ -1,204 +1,339 @@
+import asyncio
+import logging
 import random
-from datetime import datetime
-import re
+from time import perf_counter
+
+from agent.backends import RULE_ENGINE, ReplyRequest, call_backend
+from agent.cache import AnalysisCache
+from agent.features import TextFeatures, normalize
+from agent.memory import ConversationMemory
+from agent.resources import get_shared_resources
+from agent.topk import KeywordIndex
+
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- KEYWORD LEXICONS ----------
+# Stopwords (expanded)
+STOPWORDS = frozenset({
+    "i","am","the","and","a","to","my","it","me","you","is","of","in","on",
+    "that","this","for","with","was","are","be","have","has","had","at",
+    "but","or","so","if","they","them","we","he","she","his","her","their"
+})
+
+# Emotionally important words get higher weight
+EMOTIONAL_WORDS = frozenset({
+    "sad","lonely","empty","hopeless","tired","broken","anxious","stressed",
+    "afraid","panic","hurt","cry","pressure","overwhelmed","fear","pain",
+    "worthless","angry","guilty","lost","confused","depressed"
+})
+
+# Crisis-weighted words (very high importance)
+CRISIS_WORDS = frozenset({
+    "die","death","suicide","kill","end","life","save","alone","nobody"
+})
+
+# First-person vulnerability (raises urgency score)
+FIRST_PERSON = ("i", "me", "my", "myself")
+
+# Rolling context: turns kept, and how many of them count as "recent"
+CONTEXT_WINDOW = 20
+RECENT_TURNS = 5
 
 
 class HealthCoachAgent:
-    def __init__(self):
-        self.memory = []
+    def __init__(self, cache_size: int = None, keyword_capacity: int = None, seed=None,
+                 timer=None, backend=None, backend_timeout: float = 8.0,
+                 store=None, session_id: str = None, resources=None):
+        # Compiled patterns, lexicon automaton and response catalog are
+        # built once per process and shared read-only by every agent
+        self.resources = resources or get_shared_resources()
+
+        # ---- Per-user state ----
+        # Columnar turn store; indexing still yields dict-like turns
+        self.memory = ConversationMemory()
         self.context_memory = []
+        # Keyword frequencies for "Top topics"; a capacity turns it into a
+        # bounded heavy-hitters sketch for very long histories
+        self.keyword_index = KeywordIndex(keyword_capacity)
+        # Per-agent response picker; pass a seed for reproducible replays
+        self.rng = random.Random(seed)
+        # Repeated messages (quick-start buttons, "I'm tired") skip analysis.
+        # The cache is shared through resources unless a size is given.
+        if cache_size is None:
+            self.analysis_cache = self.resources.analysis_cache
+        else:
+            self.analysis_cache = AnalysisCache(cache_size)
+        # Optional agent.metrics.StageTimer; None disables stage timing
+        self.timer = timer
+        # Response backend for reply_async(); the rule engine by default
+        self.backend = backend or RULE_ENGINE
+        self.backend_timeout = backend_timeout
+        # Optional agent.storage.ConversationStore; turns are persisted
+        # under session_id in batches
+        if store is not None and not session_id:
+            raise ValueError("a session_id is required when a store is attached")
+        self.store = store
+        self.session_id = session_id
+        # Turns from earlier runs of this session (see resume())
+        self.prior_turns = 0
+        self.prior_mood_counts = {}
+        self.prior_urgency_counts = {}
+
+    @classmethod
+    def resume(cls, store, session_id: str, **kwargs) -> "HealthCoachAgent":
+        """
+        Agent for an existing session: restores the last CONTEXT_WINDOW
+        turns of context and the running counters from the store without
+        loading the full history.
+        """
+        agent = cls(store=store, session_id=session_id, **kwargs)
+        agent.context_memory = store.recent_turns(session_id, CONTEXT_WINDOW)
+        agent.prior_turns = store.turn_count(session_id)
+        agent.prior_mood_counts = store.mood_counts(session_id)
+        agent.prior_urgency_counts = store.urgency_counts(session_id)
+        return agent
 
     # ---------- MAIN REPLY ----------
     def reply(self, user_text: str) -> str:
-        text = user_text.lower().strip()
-        timestamp = datetime.now().strftime("%H:%M")
+        turn = self.record_turn(user_text)
+
+        timer = self.timer
+        t = perf_counter() if timer else 0.0
+        response = " ".join(self.response_segments(*turn))
+        if timer:
+            timer.lap("response", t)
+        return response
+
+    def reply_stream(self, user_text: str):
+        """
+        Streaming variant of reply().
+
+        The turn is analyzed and recorded immediately; the returned
+        generator then yields the response piece by piece (opener,
+        reflection, body, question, grounding line) as each is picked.
+        Joining the pieces gives exactly what reply() would return. A
+        crisis response is always the first piece and is never split.
+        """
+        return self._stream_segments(self.record_turn(user_text))
+
+    def _stream_segments(self, turn: tuple):
+        timer = self.timer
+        elapsed = 0.0
+        segments = self.response_segments(*turn)
+        first = True
+        while True:
+            t = perf_counter() if timer else 0.0
+            segment = next(segments, None)
+            if timer:
+                elapsed += perf_counter() - t
+            if segment is None:
+                break
+            yield segment if first else " " + segment
+            first = False
+        if timer:
+            timer.observe("response", elapsed)
+
+    async def reply_async(self, user_text: str) -> str:
+        """
+        Async reply through self.backend.
+
+        Crisis turns and the default rule engine answer inline. Other
+        backends share a per-loop concurrency limit and coalesce
+        identical in-flight requests; a timeout or backend error falls back
+        to the rule engine, so a slow model never blocks other sessions.
+        """
+        turn = self.record_turn(user_text)
+        text, mood, urgency, keywords, signals = turn
+
+        if self.backend.local or mood == "crisis" or urgency == "crisis":
+            return " ".join(self.response_segments(*turn))
+
+        history = tuple(m["text"] for m in self.context_memory[-RECENT_TURNS:-1])
+        request = ReplyRequest(user_text, mood, urgency, keywords, signals, history)
+        try:
+            return await call_backend(self.backend, self, request, self.backend_timeout)
+        except asyncio.TimeoutError:
+            logger.info("reply backend timed out after %.1fs; using rule engine", self.backend_timeout)
+        except Exception as e:
+            logger.warning("reply backend failed (%r); using rule engine", e)
+        return " ".join(self.response_segments(*turn))
+
+    def record_turn(self, user_text: str) -> tuple:
+        """
+        Analyze one message and store it in memory and context.
+        Returns (text, mood, urgency, keywords, signals) for the response.
+        """
+        timer = self.timer
 
         # ---- Deep analysis ----
-        mood = self.detect_mood(text)
-        urgency = self.detect_urgency(text)
-        keywords = self.extract_keywords(text)
+        text, (mood, urgency, keywords) = self.cached_analysis(user_text)
+        keywords = list(keywords)
+        t = perf_counter() if timer else 0.0
 
         # ---- Memory construction ----
-        memory_entry = {
-            "text": user_text,
-            "mood": mood,
-            "urgency": urgency,
-            "keywords": keywords,
-            "time": timestamp
-        }
-        self.memory.append(memory_entry)
-        self.context_memory.append(memory_entry)
-        self.summarize_context()
-        
-        # ---- Context synthesis (last few turns) ----
-        recent_moods = [m["mood"] for m in self.context_memory[-5:]]
-        repeated_sadness = recent_moods.count("sad") >= 2
-        repeated_stress = recent_moods.count("stress") >= 2
-
-        # ---- Conversational framing (friend energy) ----
-        openers = [
-            "Hey, I’m really glad you said that.",
-            "Alright, pause with me for a second.",
-            "I hear you — and I’m not brushing this off.",
-            "Thanks for trusting me with this.",
-            "I’m right here with you."
-        ]
+        turn = self.memory.add(user_text, mood, urgency, keywords)
+        self.keyword_index.update(keywords)
+        if self.store is not None:
+            self.store.record(
+                self.session_id, user_text, mood, urgency, keywords,
+                timestamp=self.memory.timestamp(turn)
+            )
+        self.update_context(self.memory[turn])
 
-        reflections = [
-            "What you’re describing feels heavy.",
-            "That sounds like it’s been sitting with you for a while.",
-            "Anyone in your place would feel shaken.",
-            "That’s not a small thing to carry.",
-            "It makes sense that this is affecting you."
-        ]
+        # ---- Context synthesis (last few turns) ----
+        signals = self.context_signals()
+        if timer:
+            timer.lap("context", t)
 
-        gentle_questions = [
-            "Do you want to talk about what started this?",
-            "What part of this hurts the most right now?",
-            "Has this been building up for days, or did something happen today?",
-            "What’s been looping in your head lately?",
-            "If you had words for the feeling, what would they be?"
-        ]
+        return text, mood, urgency, keywords, signals
 
-        grounding_lines = [
-            "Take a slow breath with me for a moment.",
-            "You don’t have to solve everything right now.",
-            "We can take this one step at a time.",
-            "You’re not weak for feeling this way.",
-            "I’m not going anywhere."
-        ]
+    def response_segments(self, text: str, mood: str, urgency: str, keywords: list,
+                          signals: dict):
+        """Yield the pieces of the response in order; reply() joins them with spaces."""
+        # ---- Conversational framing (friend energy) ----
+        # Templates are loaded once in agent.responses; picks use self.rng
+        responses = self.resources.responses
+        rng = self.rng
 
         # ---- Crisis overrides everything ----
         if urgency == "crisis" or mood == "crisis":
-            return self.crisis_response()
+            yield self.crisis_response()
+            return
 
         # ---- Mood-based reasoning with depth ----
 
         if mood == "sad":
-            response_parts = [
-                random.choice(openers),
-                random.choice(reflections),
-                self.generate_sad_response(text, keywords),
-            ]
-            if repeated_sadness:
-                response_parts.append(
-                    "I’ve noticed this feeling coming up more than once. That tells me it really matters."
-                )
-            response_parts.append(random.choice(gentle_questions))
-            response_parts.append(random.choice(grounding_lines))
-            return " ".join(response_parts)
+            yield responses.line("openers", rng)
+            yield responses.line("reflections", rng)
+            yield self.generate_sad_response(text, keywords)
+            if signals["repeated_sadness"]:
+                yield "I’ve noticed this feeling coming up more than once. That tells me it really matters."
+            yield responses.line("gentle_questions", rng)
+            yield responses.line("grounding_lines", rng)
 
         elif mood == "stress":
-            response_parts = [
-                random.choice(openers),
-                "It sounds like your mind has been running nonstop.",
-                self.generate_stress_response(text, keywords),
-            ]
-            if repeated_stress:
-                response_parts.append(
-                    "When stress keeps repeating like this, it usually means you’ve been pushing yourself too hard."
-                )
-            response_parts.append(random.choice(gentle_questions))
-            response_parts.append(random.choice(grounding_lines))
-            return " ".join(response_parts)
+            yield responses.line("openers", rng)
+            yield "It sounds like your mind has been running nonstop."
+            yield self.generate_stress_response(text, keywords)
+            if signals["repeated_stress"]:
+                yield "When stress keeps repeating like this, it usually means you’ve been pushing yourself too hard."
+            yield responses.line("gentle_questions", rng)
+            yield responses.line("grounding_lines", rng)
 
         else:
-            response_parts = [
-                random.choice(openers),
-                self.generate_positive_response(text, keywords),
-                random.choice([
-                    "Tell me more — I’m genuinely curious.",
-                    "What made you think about this just now?",
-                    "How are you feeling about it in this exact moment?",
-                    "That sounds meaningful to you.",
-                    "I like the way you’re thinking about this."
-                ])
-            ]
-            return " ".join(response_parts)
+            yield responses.line("openers", rng)
+            yield self.generate_positive_response(text, keywords)
+            yield responses.line("positive_followups", rng)
 
 
-        # ---------- MOOD DETECTION ----------
+    # ---------- SIDE-EFFECT-FREE ANALYSIS ----------
+    def cached_analysis(self, text: str) -> tuple:
+        """
+        (normalized text, (mood, urgency, keywords)) through the LRU
+        analysis cache. Keywords come back as a tuple so cached entries
+        cannot be mutated by callers.
+        """
+        key = normalize(text)
+        result = self.analysis_cache.get(key)
+        if result is None:
+            timer = self.timer
+            t = perf_counter() if timer else 0.0
+            features = TextFeatures(text, self.resources.lexicon)
+            if timer:
+                t = timer.lap("features", t)
+            mood = self.detect_mood(features)
+            if timer:
+                t = timer.lap("mood", t)
+            urgency = self.detect_urgency(features)
+            if timer:
+                t = timer.lap("urgency", t)
+            keywords = tuple(self.extract_keywords(features))
+            if timer:
+                timer.lap("keywords", t)
+
+            result = (mood, urgency, keywords)
+            self.analysis_cache.put(key, result)
+        return key, result
+
+    def analyze(self, text: str) -> dict:
+        """
+        Mood, urgency and keywords for one message without touching
+        memory or picking a response.
+        """
+        _, (mood, urgency, keywords) = self.cached_analysis(text)
+        return {"mood": mood, "urgency": urgency, "keywords": list(keywords)}
 
-    def detect_mood(self, text: str) -> str:
+    def analyze_batch(self, texts) -> list:
         """
-        Advanced mood detection using contextual cues, sentiment patterns,
-        and philosophical/emotional heuristics for nuanced understanding.
-        Returns one of: 'crisis', 'sad', 'stress', 'neutral', 'happy'
+        Same results as analyze() for many messages at once. Per-category
+        hit counts go into a NumPy matrix and the detect_mood /
+        detect_urgency thresholds are applied as vectorized operations.
         """
-        text_lower = text.lower()
+        from agent.batch import feature_matrix, score_moods, score_urgencies
 
-        # ---- 1. Explicit self-harm intent (strong signals) ----
-        explicit_intent_patterns = [
-            r"\bi want to die\b", r"\bkill myself\b", r"\bend my life\b",
-            r"\bcommit suicide\b", r"\bi will die\b", r"\bi plan to die\b",
-            r"\bi don't want to live\b"
-        ]
+        lexicon = self.resources.lexicon
+        features_list = [TextFeatures(t, lexicon) for t in texts]
+        if not features_list:
+            return []
 
-        # ---- 2. Passive death wishes ----
-        passive_death_patterns = [
-            r"\bi wish i was dead\b", r"\bi wish i wouldn't wake up\b",
-            r"\bit would be better if i disappeared\b",
-            r"\bi want everything to stop\b",
-            r"\btired of existing\b"
-        ]
+        matrix = feature_matrix(features_list, self.resources.patterns)
+        moods = score_moods(matrix).tolist()
+        urgencies = score_urgencies(matrix).tolist()
 
-        # ---- 3. Hopelessness / collapse language ----
-        hopelessness_patterns = [
-            r"\bno future\b", r"\bno way out\b", r"\bnothing will change\b",
-            r"\btrapped forever\b", r"\bpointless\b", r"\bmeaningless\b",
-            r"\bno reason to live\b"
+        return [
+            {
+                "mood": mood,
+                "urgency": urgency,
+                "keywords": self.extract_keywords(features),
+            }
+            for mood, urgency, features in zip(moods, urgencies, features_list)
         ]
 
-        # ---- 4. Self-worth erosion ----
-        self_worth_patterns = [
-            r"\bworthless\b", r"\bi am a burden\b",
-            r"\beveryone would be better without me\b",
-            r"\bi hate myself\b", r"\bi am broken\b",
-            r"\bi am a failure\b"
-        ]
 
-        # ---- 5. Pain intensity markers ----
-        pain_intensity_markers = [
-            "unbearable", "too much", "can't handle", "over the edge",
-            "suffocating", "crushing", "drowning", "breaking apart"
-        ]
+        # ---------- MOOD DETECTION ----------
 
-        # ---- 6. Immediacy markers ----
-        immediacy_markers = [
-            "right now", "tonight", "today", "soon",
-            "can't go on", "at my limit"
-        ]
+    def detect_mood(self, features: TextFeatures) -> str:
+        """
+        Advanced mood detection using contextual cues, sentiment patterns,
+        and philosophical/emotional heuristics for nuanced understanding.
+        Returns one of: 'crisis', 'sad', 'stress', 'neutral', 'happy'
 
-        # ---- 7. Protective language absence (important philosophical cue) ----
-        protective_terms = [
-            "maybe", "but", "hope", "trying", "getting help",
-            "talking to someone", "not sure"
-        ]
+        Takes the message's TextFeatures (a raw string is also accepted).
+        """
+        features = TextFeatures.of(features, self.resources.lexicon)
+        patterns = self.resources.patterns
+        text_lower = features.text
+        hits = features.hits
+
+        # ---- 1-4. Intent / death wish / hopelessness / self-worth ----
+        # (compiled once in agent.patterns)
+
+        # ---- 5-7. Pain intensity, immediacy, protective language ----
+        # (substring lexicons in agent.lexicon)
 
         # ---- Scoring logic (human-like reasoning) ----
         score = 0
 
 
-        def match_any(patterns):
-            return any(re.search(p, text_lower) for p in patterns)
-
-        if match_any(explicit_intent_patterns):
+        if patterns["explicit_intent"].search(text_lower):
             score += 5
 
-        if match_any(passive_death_patterns):
+        if patterns["passive_death"].search(text_lower):
             score += 4
 
-        if match_any(hopelessness_patterns):
+        if patterns["hopelessness"].search(text_lower):
             score += 3
 
-        if match_any(self_worth_patterns):
+        if patterns["self_worth"].search(text_lower):
             score += 2
 
-        score += sum(1 for w in pain_intensity_markers if w in text_lower)
-        score += sum(1 for w in immediacy_markers if w in text_lower)
+        score += hits["pain_intensity"]
+        score += hits["mood_immediacy"]
 
         # Reduce score slightly if protective language exists (ambivalence signal)
-        if any(w in text_lower for w in protective_terms):
+        if hits["protective"]:
             score -= 1
 
         # ---- Philosophical thresholding ----
@@ -208,92 +343,30 @@ class HealthCoachAgent:
             return "crisis"
 
         # 2️⃣ SAD / LOW MOOD
-        sad_patterns = [
-            r"\bsad\b", r"\blonely\b", r"\bempty\b", r"\bhopeless\b",
-            r"\bcry\b", r"\btired of life\b", r"\bbroken\b", r"\bdepressed\b",
-            r"\bheartbroken\b", r"\bdisappointed\b", r"\bmelancholy\b",
-            r"\bunhappy\b", r"\bgrief\b"
-        ]
-        for pattern in sad_patterns:
-            if re.search(pattern, text_lower):
-                return "sad"
+        if patterns["sad"].search(text_lower):
+            return "sad"
 
         # 3️⃣ STRESS / ANXIETY
-        stress_patterns = [
-            r"\bstressed\b", r"\banxious\b", r"\boverwhelmed\b", r"\bworried\b",
-            r"\bpressure\b", r"\bpanic\b", r"\bburnout\b", r"\btense\b",
-            r"\bfrustrated\b", r"\bnervous\b", r"\bconfused\b"
-        ]
-        for pattern in stress_patterns:
-            if re.search(pattern, text_lower):
-                return "stress"
+        if patterns["stress"].search(text_lower):
+            return "stress"
 
         # 4️⃣ ENHANCED HAPPINESS / POSITIVE MOOD DETECTION
-        happy_patterns = [
-            r"\bhappy\b", r"\bjoy\b", r"\bexcited\b", r"\brelieved\b",
-            r"\bcontent\b", r"\bgrateful\b", r"\boptimistic\b", r"\bpeaceful\b",
-            r"\bproud\b", r"\blight-hearted\b", r"\bserene\b", r"\bdelighted\b",
-            r"\belated happiness\b", r"\bsmiling\b", r"\blaughing\b"
-        ]
-
-        # Contextual positive phrases (implied happiness even without explicit words)
-        positive_phrase_patterns = [
-            r"felt so much better", r"finally at ease", r"things are looking up",
-            r"made progress", r"a new sense of calm", r"improved mood lately",
-            r"more confident", r"enjoying life", r"feeling less burdened",
-            r"that made my day", r"that helped me", r"light at the end",
-            r"positive change"
-        ]
-
-        # Relational / connection-based happiness
-        connection_patterns = [
-            r"feeling loved", r"in love with", r"close to", r"supported by",
-            r"filled with hope", r"grateful for", r"cherish", r"thankful for"
-        ]
-
-
-        # Lifestyle / well-being indicators that imply happiness
-        wellbeing_patterns = [
-            r"good sleep", r"sleeping better", r"healthy habits", r"more energetic",
-            r"feeling balanced", r"taking care of myself", r"have inner peace"
-        ]
-
-        # Evaluate explicit happy terms
-        for pattern in happy_patterns:
-            if re.search(pattern, text_lower):
-                return "happy"
-
-        # Evaluate positive phrase contexts
-        for pattern in positive_phrase_patterns:
-            if re.search(pattern, text_lower):
-                return "happy"
-
-        # Evaluate relational / connection-based positivity
-        for pattern in connection_patterns:
-            if re.search(pattern, text_lower):
-                return "happy"
-
-        # Evaluate lifestyle/wellbeing based happiness
-        for pattern in wellbeing_patterns:
-            if re.search(pattern, text_lower):
+        # Explicit happy terms, positive phrase contexts, relational /
+        # connection-based positivity, lifestyle/wellbeing based happiness
+        for family in ("happy", "positive_phrase", "connection", "wellbeing"):
+            if patterns[family].search(text_lower):
                 return "happy"
 
         # Subtle heuristic: a mix of many low-level positive words
-        low_positive_triggers = [
-            "smile", "peace", "fun", "hope", "calm", "relax", "good moments",
-            "uplift", "light", "spark", "joyful"
-        ]
-        pos_sub_count = sum(1 for w in low_positive_triggers if w in text_lower)
+        pos_sub_count = hits["low_positive"]
 
         # If multiple low-level positive triggers exist **and no strong negative terms**
-        if pos_sub_count >= 2 and not any(
-            neg in text_lower for neg in ["sad", "pain", "hurt", "worried", "stressed", "anxious"]
-        ):
+        if pos_sub_count >= 2 and not hits["strong_negative"]:
             return "happy"
 
         
         # ---- Philosophical fallback (subtle reasoning) ----
-        philo_mood = self.philosophical_sentiment_heuristic(text_lower)
+        philo_mood = self.philosophical_sentiment_heuristic(features)
         if philo_mood == "healthy":
             return "happy"
         if philo_mood in ["sad", "stress", "neutral"]:
@@ -308,61 +381,25 @@ class HealthCoachAgent:
         # Inspired by existentialism, stoicism, cognitive appraisal theory, and narrative psychology
 
 
-    def philosophical_sentiment_heuristic(self, text: str) -> str:
-        text_lower = text.lower()
-
-        # --- Existential themes ---
-        meaning_words = [
-            "meaning", "purpose", "why am i", "what's the point",
-            "exist", "existence", "identity", "who am i"
-        ]
-        nihilism_words = [
-            "meaningless", "pointless", "nothing matters",
-            "empty", "void", "absurd"
-        ]
+    def philosophical_sentiment_heuristic(self, features: TextFeatures) -> str:
+        hits = TextFeatures.of(features, self.resources.lexicon).hits
 
-        # --- Stoic / control dichotomy ---
-        control_words = [
-            "control", "handle", "manage", "accept", "let go",
-            "focus on", "one step", "calm"
-        ]
-        helpless_words = [
-            "can't control", "no control", "powerless",
-            "trapped", "stuck", "forced"
-        ]
-
-        # --- Cognitive distortion markers (CBT-inspired) ---
-        absolutist_words = [
-            "always", "never", "everyone", "no one",
-            "completely", "totally", "forever"
-        ]
-        self_blame_words = [
-            "my fault", "i failed", "i am useless",
-            "i am worthless", "i messed up"
-        ]
-
-        # --- Emotional polarity ---
-        positive_words = [
-            "good", "better", "hope", "love", "relief",
-            "peace", "calm", "grateful", "safe"
-        ]
-        negative_words = [
-            "bad", "worse", "pain", "hate", "fear",
-            "hurt", "angry", "alone", "tired"
-        ]
+        # Existential themes, stoic control dichotomy, cognitive distortion
+        # markers (CBT-inspired) and emotional polarity lexicons live in
+        # agent.lexicon
 
         # --- Count signals ---
-        pos_count = sum(1 for w in positive_words if w in text_lower)
-        neg_count = sum(1 for w in negative_words if w in text_lower)
+        pos_count = hits["positive"]
+        neg_count = hits["negative"]
 
-        meaning_count = sum(1 for w in meaning_words if w in text_lower)
-        nihilism_count = sum(1 for w in nihilism_words if w in text_lower)
+        meaning_count = hits["meaning"]
+        nihilism_count = hits["nihilism"]
 
-        control_count = sum(1 for w in control_words if w in text_lower)
-        helpless_count = sum(1 for w in helpless_words if w in text_lower)
+        control_count = hits["control"]
+        helpless_count = hits["helpless"]
 
-        distortion_count = sum(1 for w in absolutist_words if w in text_lower)
-        self_blame_count = sum(1 for w in self_blame_words if w in text_lower)
+        distortion_count = hits["absolutist"]
+        self_blame_count = hits["self_blame"]
 
         # --- Interpretative reasoning ---
         if nihilism_count > 0 and neg_count > 0:
@@ -393,7 +430,7 @@ class HealthCoachAgent:
 
 
         # ---------- URGENCY DETECTION ----------
-    def detect_urgency(self, text: str) -> str:
+    def detect_urgency(self, features: TextFeatures) -> str:
         """
         Human-like urgency detection using:
         - intent strength
@@ -403,74 +440,40 @@ class HealthCoachAgent:
         - escalation logic
         """
 
-        text = text.lower()
-
-        # Strong self-harm intent (highest risk)
-        high_risk_patterns = [
-            r"\bi want to die\b",
-            r"\bkill myself\b",
-            r"\bend my life\b",
-            r"\bcommit suicide\b",
-            r"\bno reason to live\b",
-            r"\bi can't go on\b",
-            r"\bi am done\b",
-            r"\bi give up\b"
-        ]
-
-        # Immediacy indicators (time + action)
-        immediacy_markers = [
-            r"\bnow\b", r"\btonight\b", r"\btoday\b",
-            r"\bright now\b", r"\bimmediately\b",
-            r"\bcan't wait\b"
-        ]
-
-        # Emotional overload / collapse language
-        overload_markers = [
-            "overwhelmed", "trapped", "suffocating",
-            "unbearable", "too much", "breaking",
-            "falling apart", "lost control", "numb"
-        ]
+        features = TextFeatures.of(features, self.resources.lexicon)
+        patterns = self.resources.patterns
+        text = features.text
+        tokens = features.tokens
+        hits = features.hits
 
-        # Hopelessness / existential despair
-        hopeless_markers = [
-            "nothing will change", "no hope", "pointless",
-            "meaningless", "empty inside", "worthless",
-            "nobody cares", "alone forever"
-        ]
+        # Strong self-harm intent and immediacy (time + action) patterns
+        # live in agent.patterns
 
-        # First-person vulnerability (raises risk score)
-        first_person = ["i", "me", "my", "myself"]
+        # Emotional overload / collapse and hopelessness markers are
+        # substring lexicons in agent.lexicon
 
         urgency_score = 0
 
         # Check high-risk intent
-        for p in high_risk_patterns:
-            if re.search(p, text):
-                urgency_score += 5
+        urgency_score += 5 * patterns["urgency_high_risk"].count(text)
 
         # Check immediacy
-        for p in immediacy_markers:
-            if re.search(p, text):
-                urgency_score += 3
+        urgency_score += 3 * patterns["urgency_immediacy"].count(text)
 
         # Emotional overload
-        for w in overload_markers:
-            if w in text:
-                urgency_score += 2
+        urgency_score += 2 * hits["overload"]
 
         # Hopelessness
-        for w in hopeless_markers:
-            if w in text:
-                urgency_score += 2
+        urgency_score += 2 * hits["hopeless"]
 
         # First-person framing increases seriousness
-        if any(fp in text.split() for fp in first_person):
+        if any(fp in tokens for fp in FIRST_PERSON):
             urgency_score += 1
 
         # Repetition / intensity (exclamation, caps)
         if text.count("!") >= 2:
             urgency_score += 1
-        if any(word.isupper() and len(word) > 3 for word in text.split()):
+        if any(word.isupper() and len(word) > 3 for word in tokens):
             urgency_score += 1
 
         # Final interpretation (agent-friendly levels)
@@ -486,7 +489,7 @@ class HealthCoachAgent:
 
 
         # ---------- KEYWORD EXTRACTION ----------
-    def extract_keywords(self, text: str) -> list:
+    def extract_keywords(self, features: TextFeatures) -> list:
         """
         More human-like keyword extraction using:
         - semantic weighting
@@ -495,32 +498,11 @@ class HealthCoachAgent:
         - repetition importance
         """
 
-        text = text.lower()
-
-        # Basic cleanup
-        words = re.findall(r'\b[a-z]+\b', text)
-
-        # Stopwords (expanded)
-        stopwords = {
-            "i","am","the","and","a","to","my","it","me","you","is","of","in","on",
-            "that","this","for","with","was","are","be","have","has","had","at",
-            "but","or","so","if","they","them","we","he","she","his","her","their"
-        }
-
-        # Emotionally important words get higher weight
-        emotional_words = {
-            "sad","lonely","empty","hopeless","tired","broken","anxious","stressed",
-            "afraid","panic","hurt","cry","pressure","overwhelmed","fear","pain",
-            "worthless","angry","guilty","lost","confused","depressed"
-        }
-
-        # Crisis-weighted words (very high importance)
-        crisis_words = {
-            "die","death","suicide","kill","end","life","save","alone","nobody"
-        }
+        # Basic cleanup (tokenized once in TextFeatures)
+        words = TextFeatures.of(features, self.resources.lexicon).words
 
         # Remove stopwords
-        filtered = [w for w in words if w not in stopwords]
+        filtered = [w for w in words if w not in STOPWORDS]
 
         # Frequency scoring
         freq = {}
@@ -533,11 +515,11 @@ class HealthCoachAgent:
             score = count
 
             # Emotional amplification
-            if word in emotional_words:
+            if word in EMOTIONAL_WORDS:
                 score += 3
 
             # Crisis amplification
-            if word in crisis_words:
+            if word in CRISIS_WORDS:
                 score += 6
 
             # Longer words often carry more meaning
@@ -550,7 +532,7 @@ class HealthCoachAgent:
         phrases = []
         for i in range(len(filtered) - 1):
             w1, w2 = filtered[i], filtered[i + 1]
-            if w1 not in stopwords and w2 not in stopwords:
+            if w1 not in STOPWORDS and w2 not in STOPWORDS:
                 phrases.append(f"{w1} {w2}")
 
         # Rank keywords
@@ -567,31 +549,7 @@ class HealthCoachAgent:
 
        # ---------- RESPONSE GENERATORS ----------
     def generate_sad_response(self, text: str, keywords: list) -> str:
-        base = [
-            "I hear you. Feeling {keywords} can be really heavy.",
-            "Your feelings are valid. {keywords} must be hard to go through.",
-            "I’m here with you. Can you tell me more about {keywords}?",
-            "It’s okay to feel this way. {keywords} can really weigh on the heart.",
-            "I understand. Experiencing {keywords} can be exhausting emotionally.",
-            "Thank you for sharing about {keywords}. I can see why it feels difficult.",
-            "I can imagine how {keywords} might make things challenging for you.",
-            "Feeling {keywords} is natural. Let’s take it one step at a time together.",
-            "I’m listening. {keywords} sounds like it’s been tough on you lately.",
-            "It sounds like {keywords} is really affecting you. I’m here to understand.",
-            "I know it’s not easy to talk about {keywords}, but you’re doing great by sharing.",
-            "Sometimes {keywords} can feel overwhelming. I’m here to help process it.",
-            "You’re not alone in feeling {keywords}. Let’s explore this together.",
-            "I can feel the weight of {keywords} in what you’re saying. Tell me more if you can.",
-            "Talking about {keywords} takes courage. I’m glad you shared it with me.",
-            "Thank you for trusting me with your thoughts about {keywords}. I’m here for you.",
-            "I notice {keywords} is significant for you. Let’s discuss how it impacts your life.",
-            "Feeling {keywords} is part of the human experience, and I want to support you through it.",
-            "I hear the sadness in {keywords}. You can share more if you feel comfortable.",
-            "It’s okay that {keywords} is bothering you. We can unpack this together."
-        ]
-        return random.choice(base).format(
-            keywords=", ".join(keywords) if keywords else "this"
-        )
+        return self.resources.responses.render("sad", self.rng, keywords)
 
 
     def generate_stress_response(self, text: str, keywords: list) -> str:
@@ -599,117 +557,74 @@ class HealthCoachAgent:
         Generates nuanced, empathetic, and guiding responses for users under stress.
         Uses context, keywords, and human psychology principles to respond meaningfully.
         """
-        base = [
-            "Stress can weigh heavily on anyone. Let’s carefully think through {keywords} together and find some clarity.",
-            "I hear that {keywords} is causing tension. It's completely normal to feel this way. Can you share more details?",
-            "Take a slow, deep breath. {keywords} might feel overwhelming now, but we can explore it step by step.",
-            "I understand that {keywords} is stressful. Sometimes naming it out loud helps. What part of {keywords} feels hardest?",
-            "It’s okay to feel overwhelmed by {keywords}. Let’s focus on what you can control and ease the pressure gradually.",
-            "Stress often comes from many layers. {keywords} might be one of them. Can you tell me what’s most pressing?",
-            "You’re not alone feeling stressed about {keywords}. Let’s break it down together and see what might help.",
-            "I notice {keywords} is creating tension. Reflecting on it can bring insight. What thoughts come to mind when you think about it?",
-            "Feeling stressed is a signal from your mind and body. {keywords} is important to discuss. Can you describe your feelings more?",
-            "Sometimes stress clouds our perspective. Talking about {keywords} can help release some of that weight. How does it make you feel physically?",
-            "Let’s approach {keywords} gently. You deserve calm and understanding as we work through it together.",
-            "I’m here with you while you process {keywords}. Naming your stress is the first step to finding balance.",
-            "Acknowledging stress is brave. {keywords} might feel heavy now, but together we can find small ways to relieve it.",
-            "Let’s explore {keywords} from different angles. What part of it triggers the strongest reaction in you?",
-            "It’s okay if {keywords} feels like too much. We can take small steps to untangle this stress slowly."
-        ]
-
-        chosen_response = random.choice(base)
-        return chosen_response.format(
-            keywords=", ".join(keywords) if keywords else "everything"
-        )
+        return self.resources.responses.render("stress", self.rng, keywords)
 
 
     def generate_positive_response(self, text: str, keywords: list) -> str:
-        base = [
-            "Thanks for sharing. {keywords} sounds interesting, tell me more.",
-            "I’m glad you told me that. What else about {keywords}?",
-            "I’m listening carefully. How does {keywords} make you feel?",
-            "Nice! Good going, {keywords} sounds interesting.",
-            "That’s really insightful. Can you elaborate more on {keywords}?",
-            "I appreciate you opening up about {keywords}. How does it affect your day-to-day?",
-            "It’s great that you mentioned {keywords}. What emotions come with it?",
-            "Wow, {keywords} seems important. Let’s explore that together.",
-            "Your thoughts on {keywords} are valuable. Tell me more.",
-            "I hear you about {keywords}. How does it influence your current mood?",
-            "Interesting perspective on {keywords}. How long have you felt this way?",
-            "I’m curious about your experience with {keywords}. Can you describe it further?",
-            "It sounds like {keywords} matters a lot to you. Let’s discuss more.",
-            "Thanks for sharing your view on {keywords}. How does it impact you?",
-            "I can see why {keywords} would be significant. Let’s unpack it a bit."
-        ]
-
-        chosen_response = random.choice(base)
-        return chosen_response.format(
-            keywords=", ".join(keywords) if keywords else "that"
-        )
+        return self.resources.responses.render("positive", self.rng, keywords)
 
 
     # ---------- CRISIS RESPONSE ----------
     def crisis_response(self) -> str:
-        responses = [
-            (
-                "I’m really glad you told me how you’re feeling. What you’re going through sounds overwhelming, "
-                "and you don’t have to face it alone.\n\n"
-                "You deserve care, understanding, and real support. If you can, please consider reaching out "
-                "to someone you trust right now—a close friend, a family member, or a mental health professional.\n\n"
-                "If you feel in immediate danger, please contact your local emergency number or a suicide prevention "
-                "hotline in your country.\n\n"
-                "You matter. Your life has value. I’m here with you, and I’m listening."
-            ),
-            (
-                "Thank you for trusting me with something this heavy. I can hear how much pain you’re in, "
-                "and it’s important to take this seriously.\n\n"
-                "You deserve help and compassion, not judgment. Please reach out to someone who can be with you "
-                "right now—whether that’s a loved one or a trained professional.\n\n"
-                "If there’s any immediate risk, please call your local emergency services or a crisis hotline.\n\n"
-                "You are not weak for needing help. You are human, and your life matters."
-            ),
-            (
-                "I’m really sorry that you’re feeling this way, and I’m glad you spoke up. These feelings can be "
-                "incredibly intense, but they don’t define your worth or your future.\n\n"
-                "It’s important to get real-time support. Please consider contacting someone you trust or a mental "
-                "health professional as soon as possible.\n\n"
-                "If you’re in immediate danger, please call your emergency number or a suicide prevention hotline.\n\n"
-                "You are important. You deserve to be here. I’m staying with you and taking you seriously."
-            ),
-            (
-                "I hear you, and I’m really glad you reached out. What you’re experiencing is serious, and you "
-                "deserve care, safety, and support.\n\n"
-                "Please try to connect with someone right now—a friend, family member, or counselor—so you don’t "
-                "have to hold this alone.\n\n"
-                "If you feel unsafe, please contact local emergency services or a crisis hotline immediately.\n\n"
-                "Your life has meaning, even if it doesn’t feel that way right now. I’m here with you."
-            )
-        ]
-
-        return random.choice(responses)
+        return self.resources.responses.line("crisis", self.rng)
 
     # ---------- CONTEXTUAL MEMORY CLEANUP ----------
+    def update_context(self, entry: dict):
+        self.context_memory.append(entry)
+        self.summarize_context()
+
     def summarize_context(self):
         # Keep last 20 messages for context
-        if len(self.context_memory) > 20:
-            self.context_memory = self.context_memory[-20:]
+        if len(self.context_memory) > CONTEXT_WINDOW:
+            self.context_memory = self.context_memory[-CONTEXT_WINDOW:]
+
+    def context_signals(self) -> dict:
+        recent_moods = [m["mood"] for m in self.context_memory[-RECENT_TURNS:]]
+        return {
+            "repeated_sadness": recent_moods.count("sad") >= 2,
+            "repeated_stress": recent_moods.count("stress") >= 2,
+        }
+
+    # ---------- RUNNING STATS ----------
+    def turn_count(self) -> int:
+        return self.prior_turns + len(self.memory)
+
+    def mood_counts(self) -> dict:
+        """Turns per mood, maintained incrementally by the memory store."""
+        counts = self.memory.mood_counts()
+        for mood, n in self.prior_mood_counts.items():
+            counts[mood] += n
+        return counts
+
+    def urgency_counts(self) -> dict:
+        """Turns per urgency level, maintained incrementally."""
+        counts = self.memory.urgency_counts()
+        for urgency, n in self.prior_urgency_counts.items():
+            counts[urgency] += n
+        return counts
 
     # ---------- REPORT GENERATION ----------
     def generate_report(self) -> str:
-        if not self.memory:
+        if self.store is not None:
+            # Whole session history, aggregated in SQL
+            total = self.store.turn_count(self.session_id)
+            moods = self.store.mood_counts(self.session_id)
+            top = self.store.top_keywords(self.session_id, 10)
+        else:
+            total = len(self.memory)
+            moods = self.mood_counts()
+            top = self.keyword_index.top(10)
+
+        if not total:
             return "No conversation data available."
 
-        total = len(self.memory)
-        crisis = sum(1 for m in self.memory if m["mood"] == "crisis")
-        sad = sum(1 for m in self.memory if m["mood"] == "sad")
-        stress = sum(1 for m in self.memory if m["mood"] == "stress")
+        crisis = moods["crisis"]
+        sad = moods["sad"]
+        stress = moods["stress"]
         healthy = total - (crisis + sad + stress)
 
-        # Top keywords used by user
-        keywords = []
-        for m in self.memory:
-            keywords.extend(m.get("keywords", []))
-        top_keywords = list(set(keywords))[:10]
+        # Top keywords used by user, most frequent first
+        top_keywords = [kw for kw, _ in top]
 
         report = (
             "📊 PERSONAL WELLNESS SUMMARY\n"
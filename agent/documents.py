@@ -0,0 +1,135 @@
+import hashlib
+import io
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+logger = logging.getLogger(__name__)
+
+MAX_DOCUMENT_BYTES = 20 * 1024 * 1024
+MAX_PAGES = 50
+CACHE_SIZE = 64
+WORKERS = 2
+
+
+# ---------- JOB ----------
+class IngestJob:
+    """
+    Text extraction for one uploaded document. Pages are appended as the
+    worker reads them, so text() can be used before the job is done.
+
+    Jobs are shared between sessions that upload the same bytes, so they
+    carry no filename; each session keeps its own display name.
+
+    status: "pending", "running", "done", "failed" or "skipped"
+    """
+
+    def __init__(self, digest: str):
+        self.digest = digest
+        self.status = "pending"
+        self.error = None
+        self.page_count = None
+        self.truncated = False
+        self._pages = []
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def progress(self) -> tuple:
+        """(pages extracted, pages to extract or None if not known yet)"""
+        with self._lock:
+            return len(self._pages), self.page_count
+
+    def pages(self, start: int = 0) -> list:
+        """Extracted page texts from index `start` on."""
+        with self._lock:
+            return self._pages[start:]
+
+    def text(self) -> str:
+        """Text of every page extracted so far."""
+        with self._lock:
+            return "\n".join(self._pages)
+
+    def _add_page(self, text: str):
+        with self._lock:
+            self._pages.append(text)
+
+    def _finish(self, status: str, error: str = None):
+        self.status = status
+        self.error = error
+        self._finished.set()
+
+
+# ---------- INGESTOR ----------
+class DocumentIngestor:
+    """
+    Background text extraction for uploaded medical documents.
+
+    PDFs are read page by page on a small thread pool (pypdf), capped at
+    `max_bytes` and `max_pages`. Jobs are cached by content hash, so
+    uploading the same file again, from any session, reuses the result.
+    Images are accepted but not read (no OCR).
+    """
+
+    def __init__(self, max_workers: int = WORKERS, max_bytes: int = MAX_DOCUMENT_BYTES,
+                 max_pages: int = MAX_PAGES, cache_size: int = CACHE_SIZE):
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.cache_size = cache_size
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="coach-ingest")
+        self._jobs = OrderedDict()  # sha256 -> IngestJob
+        self._lock = threading.Lock()
+
+    def submit(self, data: bytes) -> IngestJob:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            job = self._jobs.get(digest)
+            if job is not None:
+                self._jobs.move_to_end(digest)
+                return job
+            job = self._jobs[digest] = IngestJob(digest)
+            if len(self._jobs) > self.cache_size:
+                self._jobs.popitem(last=False)
+
+        if len(data) > self.max_bytes:
+            job._finish("skipped", f"larger than {self.max_bytes // (1024 * 1024)} MB")
+        elif not data.startswith(b"%PDF"):
+            job._finish("skipped", "only PDF text is extracted")
+        else:
+            self._pool.submit(self._extract_pdf, job, data)
+        return job
+
+    def _extract_pdf(self, job: IngestJob, data: bytes):
+        job.status = "running"
+        try:
+            from pypdf import PdfReader
+
+            reader = PdfReader(io.BytesIO(data))
+            pages = reader.pages
+            job.truncated = len(pages) > self.max_pages
+            job.page_count = min(len(pages), self.max_pages)
+            for i in range(job.page_count):
+                job._add_page(pages[i].extract_text() or "")
+        except Exception as e:
+            logger.warning("could not extract text from document %s (%r)", job.digest[:12], e)
+            job._finish("failed", str(e) or type(e).__name__)
+            return
+        job._finish("done")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=None)
+def get_document_ingestor() -> DocumentIngestor:
+    """Process-wide ingestor (one pool and one cache for every session)."""
+    return DocumentIngestor()
@@ -0,0 +1,46 @@
+import re
+
+from agent.lexicon import LEXICON
+
+
+WORD_RE = re.compile(r'\b[a-z]+\b')
+
+
+def normalize(text: str) -> str:
+    """The canonical form every analyzer sees (also the analysis cache key)."""
+    return text.lower().strip()
+
+
+class TextFeatures:
+    """
+    Everything the analyzers need from one message, computed once:
+
+    - text: normalized (lowercased, stripped) message
+    - tokens: whitespace tokens of `text`
+    - words: alphabetic words of `text` (keyword extraction)
+    - word_positions: start offset of each entry in `words`
+    - hits: per-category lexicon counts (LEXICON unless another
+      automaton is given)
+    """
+
+    __slots__ = ("raw", "text", "tokens", "words", "word_positions", "hits")
+
+    def __init__(self, raw: str, lexicon=LEXICON):
+        self.raw = raw
+        self.text = normalize(raw)
+        self.tokens = self.text.split()
+
+        self.words = []
+        self.word_positions = []
+        for m in WORD_RE.finditer(self.text):
+            self.words.append(m.group())
+            self.word_positions.append(m.start())
+
+        self.hits = lexicon.count(self.text)
+
+    @classmethod
+    def of(cls, text, lexicon=LEXICON) -> "TextFeatures":
+        """Accept either a raw string or an already-built TextFeatures."""
+        if isinstance(text, cls):
+            return text
+        return cls(text, lexicon)
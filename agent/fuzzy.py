@@ -0,0 +1,94 @@
+import math
+import re
+
+import numpy as np
+
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _key(term: str) -> str:
+    # Spacing and punctuation don't count: "chest pain" == "chestpain"
+    return NON_ALNUM_RE.sub("", term.lower())
+
+
+def trigrams(term: str) -> frozenset:
+    padded = f"$${_key(term)}$"
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """
+    Character-trigram index over a fixed vocabulary for typo-tolerant
+    lookup ("feever" -> "fever", "chestpain" -> "chest pain").
+
+    Similarity is the Dice coefficient of the trigram sets. A lookup
+    reads only the postings of the query's own trigrams, and only the
+    slice of each posting list whose terms have a compatible length
+    (found from a per-trigram table of size boundaries, not a search);
+    shared-trigram counts over those slices (one NumPy bincount) give the
+    exact score. There is no scan over the vocabulary and no
+    edit-distance computation.
+    """
+
+    def __init__(self, terms):
+        self.terms = list(dict.fromkeys(terms))
+        postings = {}
+        sizes = []
+        for term_id, term in enumerate(self.terms):
+            grams = trigrams(term)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(term_id)
+        self._sizes = np.array(sizes, dtype=np.int32)
+
+        # gram -> (term ids sorted by trigram count, bounds) where
+        # bounds[k] is how many of those terms have at most k trigrams
+        self._max_size = int(self._sizes.max(initial=0))
+        every_size = np.arange(self._max_size + 1)
+        self._postings = {}
+        for gram, ids in postings.items():
+            ids = np.array(ids, dtype=np.int32)
+            ids = ids[np.argsort(self._sizes[ids], kind="stable")]
+            bounds = np.searchsorted(self._sizes[ids], every_size, side="right")
+            self._postings[gram] = (ids, bounds.tolist())
+
+    def lookup(self, query: str, threshold: float = 0.6, limit: int = 5) -> list:
+        """[(term, similarity)] at or above threshold, best first."""
+        grams = trigrams(query)
+        if not grams or not 0 < threshold <= 1:
+            return []
+
+        # Dice >= t needs at least t*|q|/(2-t) shared trigrams, and a term
+        # with between t*|q|/(2-t) and (2-t)*|q|/t trigrams of its own
+        size = len(grams)
+        needed = max(1, math.ceil(threshold * size / (2 - threshold) - 1e-9))
+        # Sizes are whole numbers: keep terms with shortest < n <= longest
+        shortest = min(max(math.floor(threshold * size / (2 - threshold) - 1e-9), 0), self._max_size)
+        longest = min(math.floor((2 - threshold) * size / threshold + 1e-9), self._max_size)
+        if longest <= shortest:
+            return []
+
+        slices = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                ids, bounds = posting
+                lo, hi = bounds[shortest], bounds[longest]
+                if hi > lo:
+                    slices.append(ids[lo:hi])
+        if not slices:
+            return []
+
+        shared = np.bincount(np.concatenate(slices))
+        term_ids = np.flatnonzero(shared >= needed)
+        scores = 2 * shared[term_ids] / (size + self._sizes[term_ids])
+        keep = scores >= threshold
+        term_ids, scores = term_ids[keep], scores[keep]
+        order = np.lexsort((term_ids, -scores))[:limit]
+        return [(self.terms[term_ids[i]], float(scores[i])) for i in order]
+
+    def best(self, query: str, threshold: float = 0.6):
+        """Closest term at or above threshold, or None."""
+        found = self.lookup(query, threshold, limit=1)
+        return found[0][0] if found else None
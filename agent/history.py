@@ -0,0 +1,238 @@
+import re
+from collections import OrderedDict
+
+
+# ---------- VOCABULARY ----------
+# canonical name -> ways people write it
+CONDITION_TERMS = {
+    "diabetes": ["diabetes", "diabetic", "type 1 diabetes", "type 2 diabetes", "t2dm"],
+    "hypertension": ["hypertension", "high blood pressure", "high bp"],
+    "asthma": ["asthma", "asthmatic"],
+    "copd": ["copd", "chronic bronchitis", "emphysema"],
+    "heart disease": ["heart disease", "coronary", "heart attack", "angina", "cardiac", "arrhythmia"],
+    "thyroid disorder": ["thyroid", "hypothyroid", "hypothyroidism", "hyperthyroid", "hyperthyroidism"],
+    "kidney disease": ["kidney disease", "ckd", "renal failure", "kidney stones"],
+    "migraine": ["migraine", "migraines"],
+    "epilepsy": ["epilepsy", "seizures"],
+    "cancer": ["cancer", "tumour", "tumor", "chemotherapy"],
+    "depression": ["depression", "depressive"],
+    "anxiety": ["anxiety", "panic disorder"],
+    "high cholesterol": ["high cholesterol", "cholesterol", "hyperlipidemia"],
+    "arthritis": ["arthritis", "rheumatoid"],
+    "surgery": ["surgery", "operation", "operated", "bypass", "appendectomy"],
+}
+
+MEDICATIONS = [
+    "metformin", "insulin", "glimepiride", "salbutamol", "albuterol", "inhaler",
+    "budesonide", "montelukast", "aspirin", "clopidogrel", "warfarin", "atorvastatin",
+    "rosuvastatin", "amlodipine", "lisinopril", "losartan", "telmisartan", "metoprolol",
+    "levothyroxine", "thyroxine", "omeprazole", "pantoprazole", "paracetamol",
+    "ibuprofen", "sertraline", "fluoxetine", "escitalopram",
+]
+
+_TERM_NAMES = {term: name for name, terms in CONDITION_TERMS.items() for term in terms}
+
+
+def _alternation(words) -> str:
+    # Longest first so "type 2 diabetes" wins over "diabetes"
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+DOSE = r"\d+(?:\.\d+)?\s*(?:mg|mcg|g|ml|iu|units?)"
+# Unlisted drugs are picked up only with a dose and a common drug-name
+# ending ("ramipril 5 mg"), so "took 500 mg" is not a medication
+DRUG_SUFFIXES = (
+    "pril", "sartan", "olol", "statin", "prazole", "dipine", "formin", "gliptin",
+    "cillin", "mycin", "cycline", "floxacin", "azepam", "oxetine", "triptan",
+    "tidine", "sone", "lone", "zole", "vir", "mab",
+)
+CONDITION_RE = re.compile(rf"\b({_alternation(_TERM_NAMES)})\b")
+MEDICATION_RE = re.compile(
+    rf"\b({_alternation(MEDICATIONS)})\b(?:\s+({DOSE})\b)?"
+    rf"|\b([a-z][a-z-]*(?:{_alternation(DRUG_SUFFIXES)}))\s+({DOSE})\b"
+)
+ALLERGY_LIST_RE = re.compile(r"\ballerg(?:ic|y|ies)\s*(?:to|:|-)\s*([^.;\n]+)")
+ALLERGY_SUFFIX_RE = re.compile(r"\b([a-z][a-z-]+) allergy\b")
+NO_ALLERGY_RE = re.compile(r"\bno (?:known )?(?:drug )?allerg|\bnkda\b")
+# What follows one of these in a clause is not the user's own history:
+# "no history of diabetes", "denies asthma", "mother has heart disease"
+NOT_OWN_RE = re.compile(
+    r"\b(?:no|not|never|denies|denied|negative for|without|free of|ruled out"
+    r"|family history|fhx?|mother|father|mom|dad|parents?|brother|sister|siblings?"
+    r"|grandmother|grandfather|grandparents?|aunt|uncle)\b"
+)
+# ...until the clause turns: "no asthma but diabetes since 2015"
+CLAUSE_SPLIT_RE = re.compile(r"\b(?:but|however|although|though|except|apart from|aside from)\b")
+DATE_RE = re.compile(
+    r"\b(\d{1,2}[/-]\d{1,2}[/-](?:19|20)\d{2}"
+    r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+(?:19|20)\d{2}"
+    r"|(?:19|20)\d{2})\b"
+)
+SENTENCE_END_RE = re.compile(r"[.;!?\n]")
+LIST_SPLIT_RE = re.compile(r",|/|\band\b|\bor\b")
+
+
+# ---------- PROFILE ----------
+class _SourceProfile:
+    """Facts from one source (the history text box or one document)."""
+
+    __slots__ = ("conditions", "medications", "allergies", "dates", "pending")
+
+    def __init__(self):
+        self.conditions = OrderedDict()  # name -> first date seen with it, or None
+        self.medications = OrderedDict()  # name -> dose or None
+        self.allergies = OrderedDict()
+        self.dates = OrderedDict()
+        self.pending = ""
+
+
+def _remember(entries: OrderedDict, key, value, limit: int):
+    """Insert or refresh key; drop the least recently mentioned past limit."""
+    if key in entries:
+        if entries[key] is None:
+            entries[key] = value
+        entries.move_to_end(key)
+        return
+    entries[key] = value
+    if len(entries) > limit:
+        entries.popitem(last=False)
+
+
+class HistorySummarizer:
+    """
+    Incremental summary of free-text medical history.
+
+    Text is fed per source as it arrives; only complete sentences are
+    parsed and nothing but the extracted facts is kept, so memory is
+    bounded by `max_items` per category and `max_pending` characters of
+    unfinished sentence per source, however much text comes in.
+
+    Negated and family-history mentions are not the user's own:
+
+    >>> h = HistorySummarizer()
+    >>> h.feed("history", "No history of diabetes or asthma. "
+    ...        "Family history of heart disease. Hypertension since 2019.")
+    >>> [c["name"] for c in h.profile()["conditions"]]
+    ['hypertension']
+    >>> h.feed("notes", "Denies COPD but had surgery in 2021, BP normal. "
+    ...        "I avoid sugar. Took 500 mg yesterday; ramipril 5 mg daily.")
+    >>> [c["name"] for c in h.profile()["conditions"]], h.profile()["medications"]
+    (['hypertension', 'surgery'], ['ramipril 5 mg'])
+    """
+
+    def __init__(self, max_items: int = 32, max_pending: int = 4096, max_sources: int = 16):
+        self.max_items = max_items
+        self.max_pending = max_pending
+        self.max_sources = max_sources
+        self._sources = OrderedDict()  # source -> _SourceProfile
+        self._profile = None
+        # Bumped whenever the profile may have changed (cheap cache key)
+        self.version = 0
+
+    # ---------- INPUT ----------
+    def feed(self, source: str, text: str, final: bool = True):
+        """
+        Add text for a source. With final=False a trailing partial
+        sentence is held back until more text (or a final feed) arrives.
+        """
+        profile = self._sources.get(source)
+        if profile is None:
+            profile = self._sources[source] = _SourceProfile()
+            if len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+
+        text = profile.pending + text.lower()
+        if final:
+            complete, profile.pending = text, ""
+        else:
+            cut = 0
+            for match in SENTENCE_END_RE.finditer(text):
+                cut = match.end()
+            if len(text) - cut > self.max_pending:
+                cut = len(text)
+            complete, profile.pending = text[:cut], text[cut:]
+
+        if complete.strip():
+            for sentence in SENTENCE_END_RE.split(complete):
+                if sentence.strip():
+                    self._parse(profile, sentence)
+            self._profile = None
+            self.version += 1
+
+    def reset(self, source: str):
+        """Forget a source (e.g. the history text was edited)."""
+        if self._sources.pop(source, None) is not None:
+            self._profile = None
+            self.version += 1
+
+    def _parse(self, profile: _SourceProfile, sentence: str):
+        limit = self.max_items
+        own = []
+        for clause in CLAUSE_SPLIT_RE.split(sentence):
+            cue = NOT_OWN_RE.search(clause)
+            own.append(clause[:cue.start()] if cue else clause)
+        sentence = "; ".join(own)
+
+        dates = DATE_RE.findall(sentence)
+        for date in dates:
+            _remember(profile.dates, date, None, limit)
+        when = dates[0] if dates else None
+
+        for match in CONDITION_RE.finditer(sentence):
+            _remember(profile.conditions, _TERM_NAMES[match.group(1)], when, limit)
+
+        for match in MEDICATION_RE.finditer(sentence):
+            name = match.group(1) or match.group(3)
+            dose = match.group(2) or match.group(4)
+            _remember(profile.medications, name, dose, limit)
+
+        if NO_ALLERGY_RE.search(sentence):
+            return
+        allergens = ALLERGY_SUFFIX_RE.findall(sentence)
+        for match in ALLERGY_LIST_RE.finditer(sentence):
+            allergens.extend(LIST_SPLIT_RE.split(match.group(1)))
+        for allergen in allergens:
+            allergen = " ".join(allergen.split()[:3])
+            if allergen and allergen not in ("none", "nil"):
+                _remember(profile.allergies, allergen, None, limit)
+
+    # ---------- OUTPUT ----------
+    def profile(self) -> dict:
+        """Merged profile across sources (cached until the next change)."""
+        if self._profile is not None:
+            return self._profile
+
+        conditions, medications = OrderedDict(), OrderedDict()
+        allergies, dates = OrderedDict(), OrderedDict()
+        for source in self._sources.values():
+            for name, when in source.conditions.items():
+                _remember(conditions, name, when, self.max_items)
+            for name, dose in source.medications.items():
+                _remember(medications, name, dose, self.max_items)
+            for name in source.allergies:
+                _remember(allergies, name, None, self.max_items)
+            for date in source.dates:
+                _remember(dates, date, None, self.max_items)
+
+        self._profile = {
+            "conditions": [{"name": n, "date": d} for n, d in conditions.items()],
+            "medications": [f"{n} {d}" if d else n for n, d in medications.items()],
+            "allergies": list(allergies),
+            "dates": list(dates),
+        }
+        return self._profile
+
+    def summary(self) -> str:
+        """One short line per non-empty category, for display."""
+        profile = self.profile()
+        lines = []
+        if profile["conditions"]:
+            lines.append("Conditions: " + ", ".join(
+                f"{c['name']} ({c['date']})" if c["date"] else c["name"]
+                for c in profile["conditions"]
+            ))
+        if profile["medications"]:
+            lines.append("Medications: " + ", ".join(profile["medications"]))
+        if profile["allergies"]:
+            lines.append("Allergies: " + ", ".join(profile["allergies"]))
+        return "\n".join(lines)
@@ -0,0 +1,215 @@
+"""
+Compiled, memory-mapped condition knowledge base for the Diagnosis page.
+
+    python -m agent.knowledge_base build [-s RULES.json] [-o PATH]
+
+File layout (little-endian):
+
+    header   magic "PHKB", version u16, reserved u16, rule count u32,
+             index offset u32, index length u32, source size u64,
+             source mtime (ns) u64
+    offsets  (count + 2) u32: start of each record, then the fallback
+             record, then the end of the last record
+    records  one UTF-8 JSON object per condition (condition, questions,
+             risk, advice), then the fallback
+    index    one JSON list of {"name", "requires", "risk"}: all the rule
+             engine needs to build its term index
+
+The rule table is data (symptom_rules.json); the compiled file is what
+the app reads at runtime. Records are decoded only for the condition
+that matches. The file is opened read-only with mmap, so worker
+processes share its pages through the OS page cache instead of each
+holding a copy of the catalog.
+
+The header records the size and mtime of the table it was built from,
+so a stale file is spotted with one stat() and rebuilt; the table is
+only parsed when building. Without a table next to the code, the
+compiled file is used as is. Files live in a cache directory
+(COACH_KB_PATH overrides), and if that isn't writable the engine is
+built from the table in memory instead.
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+from functools import lru_cache
+
+from agent.symptom_rules import SymptomRuleEngine
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PHKB"
+VERSION = 3
+HEADER = struct.Struct("<4sHHIIIQQ")
+OFFSET = struct.Struct("<I")
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symptom_rules.json")
+DEFAULT_PATH = os.environ.get("COACH_KB_PATH") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "personal-health-coach", "symptom_kb.bin",
+)
+
+PAYLOAD_FIELDS = ("condition", "questions", "risk", "advice")
+INDEX_FIELDS = ("name", "requires", "risk")
+
+
+# ---------- BUILD ----------
+def _encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_rules(source: str = RULES_PATH) -> tuple:
+    """(rules, fallback) from a JSON rule table."""
+    with open(source, encoding="utf-8") as f:
+        table = json.load(f)
+    return table["rules"], table["fallback"]
+
+
+def source_stamp(source: str) -> tuple:
+    """(size, mtime in ns) of a rule table, as stored in the header."""
+    stat = os.stat(source)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build(source: str, path: str) -> int:
+    """Compile the rule table at `source` into `path` (written atomically)."""
+    # Stamped before reading, so an edit made meanwhile still looks stale
+    stamp = source_stamp(source)
+    rules, fallback = load_rules(source)
+    records = [_encode({f: rule[f] for f in PAYLOAD_FIELDS}) for rule in rules]
+    records.append(_encode({f: fallback[f] for f in PAYLOAD_FIELDS}))
+    index = _encode([{f: rule[f] for f in INDEX_FIELDS} for rule in rules])
+
+    start = HEADER.size + OFFSET.size * (len(records) + 1)
+    offsets = [start]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".symptom_kb-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(
+                MAGIC, VERSION, 0, len(rules), offsets[-1], len(index), *stamp
+            ))
+            for offset in offsets:
+                f.write(OFFSET.pack(offset))
+            for record in records:
+                f.write(record)
+            f.write(index)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(rules)
+
+
+# ---------- READ ----------
+class KnowledgeBase(Sequence):
+    """Read-only view of a compiled knowledge base; kb[i] decodes record i."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f"{path}: not a version {VERSION} knowledge base")
+        magic, version, _, count, index_offset, index_length, size, mtime = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: not a version {VERSION} knowledge base")
+        self.source_stamp = (size, mtime)
+        self._count = count
+        self._index_span = (index_offset, index_offset + index_length)
+
+    def _record(self, i: int) -> dict:
+        start, end = struct.unpack_from("<II", self._map, HEADER.size + OFFSET.size * i)
+        return json.loads(self._map[start:end])
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i: int) -> dict:
+        if not -self._count <= i < self._count:
+            raise IndexError("knowledge base record out of range")
+        return self._record(i % self._count)
+
+    @property
+    def fallback(self) -> dict:
+        return self._record(self._count)
+
+    def index(self) -> list:
+        start, end = self._index_span
+        return json.loads(self._map[start:end])
+
+    def close(self):
+        self._map.close()
+
+
+@lru_cache(maxsize=None)
+def get_symptom_engine(path: str = DEFAULT_PATH, source: str = RULES_PATH) -> SymptomRuleEngine:
+    """
+    Rule engine over the compiled knowledge base, loaded on first use.
+    A missing or stale file (built from a different `source` table) is
+    compiled first; if it can't be written, the engine is built from the
+    table in memory.
+    """
+    try:
+        stamp = source_stamp(source)
+    except FileNotFoundError:
+        stamp = None  # no table shipped: the compiled file is all there is
+    try:
+        kb = _open_current(path, stamp)
+        if kb is None:
+            build(source, path)
+            kb = _open_current(path, source_stamp(source))
+    except OSError as e:
+        if stamp is None:
+            raise
+        logger.warning("knowledge base %s unavailable (%r); using in-memory rules", path, e)
+        kb = None
+    if kb is None:
+        # Only if the table changed again while it was being compiled
+        return SymptomRuleEngine(*load_rules(source))
+    return SymptomRuleEngine(kb.index(), kb.fallback, payloads=kb)
+
+
+def _open_current(path: str, stamp):
+    """The knowledge base at path if it was built from the table with this stamp."""
+    if not os.path.exists(path):
+        return None
+    try:
+        kb = KnowledgeBase(path)
+    except ValueError:
+        return None
+    if stamp is not None and kb.source_stamp != stamp:
+        kb.close()
+        return None
+    return kb
+
+
+# ---------- CLI ----------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m agent.knowledge_base")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("-s", "--source", default=RULES_PATH, help="JSON rule table")
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    count = build(args.source, args.output)
+    print(f"wrote {count} conditions to {args.output} "
+          f"({os.path.getsize(args.output)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
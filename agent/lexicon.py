@@ -0,0 +1,166 @@
+from collections import deque
+
+
+# ---------- SUBSTRING LEXICONS ----------
+# Every plain-substring word list the analyzers score with. A category's
+# hit count is the number of distinct entries that occur anywhere in the
+# text, i.e. exactly what `sum(1 for w in words if w in text)` returned.
+
+LEXICONS = {
+    # detect_mood: crisis scoring
+    "pain_intensity": [
+        "unbearable", "too much", "can't handle", "over the edge",
+        "suffocating", "crushing", "drowning", "breaking apart"
+    ],
+    "mood_immediacy": [
+        "right now", "tonight", "today", "soon",
+        "can't go on", "at my limit"
+    ],
+    # Protective language absence (important philosophical cue)
+    "protective": [
+        "maybe", "but", "hope", "trying", "getting help",
+        "talking to someone", "not sure"
+    ],
+
+    # detect_mood: subtle positive heuristic
+    "low_positive": [
+        "smile", "peace", "fun", "hope", "calm", "relax", "good moments",
+        "uplift", "light", "spark", "joyful"
+    ],
+    "strong_negative": [
+        "sad", "pain", "hurt", "worried", "stressed", "anxious"
+    ],
+
+    # philosophical_sentiment_heuristic
+    # --- Existential themes ---
+    "meaning": [
+        "meaning", "purpose", "why am i", "what's the point",
+        "exist", "existence", "identity", "who am i"
+    ],
+    "nihilism": [
+        "meaningless", "pointless", "nothing matters",
+        "empty", "void", "absurd"
+    ],
+    # --- Stoic / control dichotomy ---
+    "control": [
+        "control", "handle", "manage", "accept", "let go",
+        "focus on", "one step", "calm"
+    ],
+    "helpless": [
+        "can't control", "no control", "powerless",
+        "trapped", "stuck", "forced"
+    ],
+    # --- Cognitive distortion markers (CBT-inspired) ---
+    "absolutist": [
+        "always", "never", "everyone", "no one",
+        "completely", "totally", "forever"
+    ],
+    "self_blame": [
+        "my fault", "i failed", "i am useless",
+        "i am worthless", "i messed up"
+    ],
+    # --- Emotional polarity ---
+    "positive": [
+        "good", "better", "hope", "love", "relief",
+        "peace", "calm", "grateful", "safe"
+    ],
+    "negative": [
+        "bad", "worse", "pain", "hate", "fear",
+        "hurt", "angry", "alone", "tired"
+    ],
+
+    # detect_urgency
+    # Emotional overload / collapse language
+    "overload": [
+        "overwhelmed", "trapped", "suffocating",
+        "unbearable", "too much", "breaking",
+        "falling apart", "lost control", "numb"
+    ],
+    # Hopelessness / existential despair
+    "hopeless": [
+        "nothing will change", "no hope", "pointless",
+        "meaningless", "empty inside", "worthless",
+        "nobody cares", "alone forever"
+    ],
+}
+
+
+# ---------- AHO-CORASICK MATCHER ----------
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over every lexicon at once.
+
+    A single left-to-right pass finds all entries that occur in the text,
+    however many lexicons there are. Words shared between categories
+    (e.g. "hope", "calm") are stored once and credited to each category.
+    """
+
+    def __init__(self, lexicons: dict):
+        self.categories = tuple(lexicons)
+        self.words = []
+        self.word_categories = []
+
+        word_ids = {}
+        for category, words in lexicons.items():
+            for word in words:
+                if word not in word_ids:
+                    word_ids[word] = len(self.words)
+                    self.words.append(word)
+                    self.word_categories.append([])
+                if category not in self.word_categories[word_ids[word]]:
+                    self.word_categories[word_ids[word]].append(category)
+        self.word_categories = [tuple(c) for c in self.word_categories]
+
+        # ---- Trie ----
+        self._goto = [{}]
+        self._out = [()]
+        for word_id, word in enumerate(self.words):
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (word_id,)
+
+        # ---- Failure links (BFS), outputs merged along them ----
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def scan(self, text: str) -> set:
+        """Ids of every lexicon word that occurs in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def count(self, text: str) -> dict:
+        """Per-category number of distinct words found in text."""
+        counts = dict.fromkeys(self.categories, 0)
+        for word_id in self.scan(text):
+            for category in self.word_categories[word_id]:
+                counts[category] += 1
+        return counts
+
+
+LEXICON = KeywordAutomaton(LEXICONS)
@@ -0,0 +1,177 @@
+"""
+Local load generator for agent.service.
+
+Opens --concurrency keep-alive connections and fires a mix of /reply and
+/analyze requests for --duration seconds, then prints requests per second
+and p50/p99 latency per endpoint. Standard library only.
+
+    python -m agent.service --workers 4 &
+    python -m agent.loadgen --url http://127.0.0.1:8000 --concurrency 64 --duration 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+MESSAGES = [
+    "I feel sad and low these days",
+    "I am stressed and overwhelmed",
+    "I want to improve my lifestyle and health",
+    "I'm tired",
+    "work has been a lot this week but I'm managing",
+    "I finally had a good sleep and feel more energetic",
+    "my exams are next week and I can't focus",
+    "nothing feels right lately and I feel alone",
+]
+
+# A worker whose connection fails waits before reconnecting, doubling
+# the wait on each failure in a row, so a server that is down isn't
+# hammered in a tight loop
+RETRY_DELAY = 0.05
+MAX_RETRY_DELAY = 1.0
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client for JSON requests."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, payload: dict = None) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        )
+        self.writer.write(head.encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def _worker(index: int, host: str, port: int, deadline: float, reply_share: float,
+                  latencies: dict, errors: Counter):
+    rng = random.Random(index)
+    conn = Connection(host, port)
+    session_id = f"load-{index}"
+    delay = RETRY_DELAY
+    try:
+        while time.perf_counter() < deadline:
+            text = rng.choice(MESSAGES)
+            if rng.random() < reply_share:
+                endpoint, payload = "/reply", {"session_id": session_id, "text": text}
+            else:
+                endpoint, payload = "/analyze", {"text": text}
+
+            start = time.perf_counter()
+            try:
+                status = await conn.request("POST", endpoint, payload)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+                errors[f"{endpoint}: {type(e).__name__}"] += 1
+                conn.close()
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.perf_counter())))
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+            delay = RETRY_DELAY
+            elapsed = time.perf_counter() - start
+            if status != 200:
+                errors[f"{endpoint}: HTTP {status}"] += 1
+            latencies.setdefault(endpoint, []).append(elapsed)
+    finally:
+        conn.close()
+
+
+def _percentile(samples: list, q: float) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(q) - 1]
+
+
+async def run(url: str, concurrency: int, duration: float, reply_share: float) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+
+    latencies, errors = {}, Counter()  # error kind -> count
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _worker(i, host, port, deadline, reply_share, latencies, errors)
+        for i in range(concurrency)
+    ))
+    wall = time.perf_counter() - started
+
+    everything = [x for samples in latencies.values() for x in samples]
+    summary = {
+        "requests": len(everything),
+        "errors": sum(errors.values()),
+        "error_kinds": dict(errors.most_common()),
+        "rps": len(everything) / wall if wall else 0.0,
+        "endpoints": {},
+    }
+    for endpoint, samples in sorted(latencies.items()) + [("all", everything)]:
+        summary["endpoints"][endpoint] = {
+            "count": len(samples),
+            "p50_ms": _percentile(samples, 50) * 1000,
+            "p99_ms": _percentile(samples, 99) * 1000,
+        }
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m agent.loadgen")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--reply-share", type=float, default=0.7,
+                        help="fraction of requests sent to /reply (rest go to /analyze)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run(args.url, args.concurrency, args.duration, args.reply_share))
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"requests: {summary['requests']}  errors: {summary['errors']}  "
+          f"throughput: {summary['rps']:.1f} req/s")
+    for kind, count in summary["error_kinds"].items():
+        print(f"  error {kind}: {count}")
+    for endpoint, stats in summary["endpoints"].items():
+        print(f"  {endpoint:<10} n={stats['count']:<8} "
+              f"p50={stats['p50_ms']:.2f} ms  p99={stats['p99_ms']:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
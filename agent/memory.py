@@ -0,0 +1,170 @@
+import time
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+
+
+MOODS = ("crisis", "sad", "stress", "neutral", "happy")
+URGENCIES = ("crisis", "high", "medium", "normal")
+
+MOOD_CODES = {m: i for i, m in enumerate(MOODS)}
+URGENCY_CODES = {u: i for i, u in enumerate(URGENCIES)}
+
+
+class ConversationMemory:
+    """
+    Columnar store for conversation turns.
+
+    Instead of one dict per turn, every field lives in its own compact
+    column:
+    - text: one shared UTF-8 buffer plus offsets
+    - mood / urgency: one-byte codes
+    - time: epoch seconds
+    - keywords: ids into an interned vocabulary, plus per-turn offsets
+
+    Indexing and iteration still hand out dict-like views, so code that
+    reads `m["mood"]` or `m.get("keywords", [])` keeps working.
+
+    Per-mood and per-urgency totals are kept up to date on every add(),
+    so stats never need a pass over the history.
+
+    The text buffer dominates what is left: for chat-length messages
+    this takes roughly 3-5x less memory than a list of dicts, not more.
+    """
+
+    def __init__(self):
+        self._text = bytearray()
+        self._text_offsets = array("Q", [0])
+        self._moods = array("b")
+        self._urgencies = array("b")
+        self._times = array("q")
+        self._keyword_ids = array("I")
+        self._keyword_offsets = array("Q", [0])
+        self._vocab = []
+        self._vocab_ids = {}
+        self._mood_counts = [0] * len(MOODS)
+        self._urgency_counts = [0] * len(URGENCIES)
+
+    # ---------- WRITING ----------
+    def add(self, text: str, mood: str, urgency: str, keywords, timestamp: int = None) -> int:
+        """Store one turn and return its index."""
+        self._text += text.encode("utf-8")
+        self._text_offsets.append(len(self._text))
+        mood_code, urgency_code = MOOD_CODES[mood], URGENCY_CODES[urgency]
+        self._moods.append(mood_code)
+        self._urgencies.append(urgency_code)
+        self._mood_counts[mood_code] += 1
+        self._urgency_counts[urgency_code] += 1
+        self._times.append(int(time.time()) if timestamp is None else int(timestamp))
+
+        for kw in keywords:
+            kw_id = self._vocab_ids.get(kw)
+            if kw_id is None:
+                kw_id = len(self._vocab)
+                self._vocab.append(kw)
+                self._vocab_ids[kw] = kw_id
+            self._keyword_ids.append(kw_id)
+        self._keyword_offsets.append(len(self._keyword_ids))
+
+        return len(self._moods) - 1
+
+    def append(self, entry: dict):
+        """Dict-style append: text, mood, urgency, keywords, optional timestamp."""
+        self.add(
+            entry["text"], entry["mood"], entry["urgency"],
+            entry.get("keywords", ()), entry.get("timestamp")
+        )
+
+    # ---------- RUNNING COUNTERS ----------
+    def mood_counts(self) -> dict:
+        return dict(zip(MOODS, self._mood_counts))
+
+    def urgency_counts(self) -> dict:
+        return dict(zip(URGENCIES, self._urgency_counts))
+
+    # ---------- COLUMN ACCESS ----------
+    def text(self, index: int) -> str:
+        index = self._index(index)
+        start, end = self._text_offsets[index], self._text_offsets[index + 1]
+        return self._text[start:end].decode("utf-8")
+
+    def mood(self, index: int) -> str:
+        return MOODS[self._moods[index]]
+
+    def urgency(self, index: int) -> str:
+        return URGENCIES[self._urgencies[index]]
+
+    def timestamp(self, index: int) -> int:
+        return self._times[index]
+
+    def keywords(self, index: int) -> list:
+        index = self._index(index)
+        start, end = self._keyword_offsets[index], self._keyword_offsets[index + 1]
+        return [self._vocab[i] for i in self._keyword_ids[start:end]]
+
+    def _index(self, index: int) -> int:
+        n = len(self._moods)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("turn index out of range")
+        return index
+
+    # ---------- SEQUENCE PROTOCOL ----------
+    def __len__(self):
+        return len(self._moods)
+
+    def __bool__(self):
+        return len(self._moods) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Turn(self, i) for i in range(*index.indices(len(self)))]
+        return Turn(self, self._index(index))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield Turn(self, i)
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the columns (excluding vocabulary)."""
+        columns = (
+            self._text_offsets, self._moods, self._urgencies, self._times,
+            self._keyword_ids, self._keyword_offsets,
+        )
+        return len(self._text) + sum(c.itemsize * len(c) for c in columns)
+
+
+class Turn(Mapping):
+    """Read-only dict view of one stored turn."""
+
+    __slots__ = ("_store", "index")
+
+    _KEYS = ("text", "mood", "urgency", "keywords", "time")
+
+    def __init__(self, store: ConversationMemory, index: int):
+        self._store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store, i = self._store, self.index
+        if key == "mood":
+            return store.mood(i)
+        if key == "urgency":
+            return store.urgency(i)
+        if key == "text":
+            return store.text(i)
+        if key == "keywords":
+            return store.keywords(i)
+        if key == "time":
+            return datetime.fromtimestamp(store.timestamp(i)).strftime("%H:%M")
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"Turn({dict(self)!r})"
@@ -0,0 +1,97 @@
+import os
+import tempfile
+from bisect import bisect_left
+from time import perf_counter
+
+
+# Upper bounds in seconds: 10µs .. 100ms, then +Inf
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus semantics)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """[(upper bound, cumulative count)] including +Inf."""
+        out, running = [], 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+
+class StageTimer:
+    """
+    Per-stage latency recorder for HealthCoachAgent.reply().
+
+    Stages: features, mood, urgency, keywords (analysis cache misses
+    only), context, response. Observations go into in-process histograms
+    and, if given, to callback(stage, seconds).
+
+    The agent only touches the timer when one is attached, so a disabled
+    timer costs a single None check per stage.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, callback=None):
+        self.buckets = tuple(buckets)
+        self.callback = callback
+        self.histograms = {}
+
+    def observe(self, stage: str, seconds: float):
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms[stage] = Histogram(self.buckets)
+        hist.observe(seconds)
+        if self.callback is not None:
+            self.callback(stage, seconds)
+
+    def lap(self, stage: str, start: float) -> float:
+        """Record time since start under stage; return now for the next lap."""
+        now = perf_counter()
+        self.observe(stage, now - start)
+        return now
+
+    # ---------- EXPORT ----------
+    def to_prometheus(self, name: str = "coach_reply_stage_seconds") -> str:
+        lines = [
+            f"# HELP {name} Time spent in each HealthCoachAgent.reply() stage.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, hist in sorted(self.histograms.items()):
+            for bound, total in hist.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {total}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {hist.sum!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, name: str = "coach_reply_stage_seconds"):
+        """Atomically write a node_exporter textfile-collector file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(name))
+        os.replace(tmp, path)
+
+    def summary(self) -> dict:
+        """{stage: (count, mean seconds)} for quick inspection."""
+        return {
+            stage: (hist.count, hist.sum / hist.count if hist.count else 0.0)
+            for stage, hist in self.histograms.items()
+        }
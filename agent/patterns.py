@@ -0,0 +1,119 @@
+import re
+
+
+# ---------- PATTERN SOURCES ----------
+# Raw regex sources for every category the agent checks. They are compiled
+# once at import into PATTERNS below, so the analyzers never hand raw
+# strings to re.search on the hot path.
+
+PATTERN_SOURCES = {
+    # detect_mood: crisis scoring
+    "explicit_intent": [
+        r"\bi want to die\b", r"\bkill myself\b", r"\bend my life\b",
+        r"\bcommit suicide\b", r"\bi will die\b", r"\bi plan to die\b",
+        r"\bi don't want to live\b"
+    ],
+    "passive_death": [
+        r"\bi wish i was dead\b", r"\bi wish i wouldn't wake up\b",
+        r"\bit would be better if i disappeared\b",
+        r"\bi want everything to stop\b",
+        r"\btired of existing\b"
+    ],
+    "hopelessness": [
+        r"\bno future\b", r"\bno way out\b", r"\bnothing will change\b",
+        r"\btrapped forever\b", r"\bpointless\b", r"\bmeaningless\b",
+        r"\bno reason to live\b"
+    ],
+    "self_worth": [
+        r"\bworthless\b", r"\bi am a burden\b",
+        r"\beveryone would be better without me\b",
+        r"\bi hate myself\b", r"\bi am broken\b",
+        r"\bi am a failure\b"
+    ],
+
+    # detect_mood: mood families
+    "sad": [
+        r"\bsad\b", r"\blonely\b", r"\bempty\b", r"\bhopeless\b",
+        r"\bcry\b", r"\btired of life\b", r"\bbroken\b", r"\bdepressed\b",
+        r"\bheartbroken\b", r"\bdisappointed\b", r"\bmelancholy\b",
+        r"\bunhappy\b", r"\bgrief\b"
+    ],
+    "stress": [
+        r"\bstressed\b", r"\banxious\b", r"\boverwhelmed\b", r"\bworried\b",
+        r"\bpressure\b", r"\bpanic\b", r"\bburnout\b", r"\btense\b",
+        r"\bfrustrated\b", r"\bnervous\b", r"\bconfused\b"
+    ],
+    "happy": [
+        r"\bhappy\b", r"\bjoy\b", r"\bexcited\b", r"\brelieved\b",
+        r"\bcontent\b", r"\bgrateful\b", r"\boptimistic\b", r"\bpeaceful\b",
+        r"\bproud\b", r"\blight-hearted\b", r"\bserene\b", r"\bdelighted\b",
+        r"\belated happiness\b", r"\bsmiling\b", r"\blaughing\b"
+    ],
+    # Contextual positive phrases (implied happiness even without explicit words)
+    "positive_phrase": [
+        r"felt so much better", r"finally at ease", r"things are looking up",
+        r"made progress", r"a new sense of calm", r"improved mood lately",
+        r"more confident", r"enjoying life", r"feeling less burdened",
+        r"that made my day", r"that helped me", r"light at the end",
+        r"positive change"
+    ],
+    # Relational / connection-based happiness
+    "connection": [
+        r"feeling loved", r"in love with", r"close to", r"supported by",
+        r"filled with hope", r"grateful for", r"cherish", r"thankful for"
+    ],
+    # Lifestyle / well-being indicators that imply happiness
+    "wellbeing": [
+        r"good sleep", r"sleeping better", r"healthy habits", r"more energetic",
+        r"feeling balanced", r"taking care of myself", r"have inner peace"
+    ],
+
+    # detect_urgency
+    "urgency_high_risk": [
+        r"\bi want to die\b",
+        r"\bkill myself\b",
+        r"\bend my life\b",
+        r"\bcommit suicide\b",
+        r"\bno reason to live\b",
+        r"\bi can't go on\b",
+        r"\bi am done\b",
+        r"\bi give up\b"
+    ],
+    "urgency_immediacy": [
+        r"\bnow\b", r"\btonight\b", r"\btoday\b",
+        r"\bright now\b", r"\bimmediately\b",
+        r"\bcan't wait\b"
+    ],
+}
+
+
+# ---------- COMPILED REGISTRY ----------
+class PatternGroup:
+    """
+    One category of patterns compiled into a single alternation.
+
+    search() answers "does any pattern match" in one scan. count() returns
+    how many distinct patterns match; the alternation acts as a gate so
+    the per-pattern regexes only run when the category fires at all.
+    """
+
+    __slots__ = ("name", "regex", "members")
+
+    def __init__(self, name: str, sources: list):
+        self.name = name
+        self.regex = re.compile("|".join(f"(?:{p})" for p in sources))
+        self.members = tuple(re.compile(p) for p in sources)
+
+    def search(self, text: str) -> bool:
+        return self.regex.search(text) is not None
+
+    def count(self, text: str) -> int:
+        if self.regex.search(text) is None:
+            return 0
+        return sum(1 for p in self.members if p.search(text))
+
+
+PATTERNS = {
+    name: PatternGroup(name, sources)
+    for name, sources in PATTERN_SOURCES.items()
+}
@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from agent.cache import AnalysisCache
+from agent.lexicon import LEXICON
+from agent.patterns import PATTERNS
+from agent.responses import RESPONSES
+
+
+SHARED_CACHE_SIZE = 4096
+
+
+class AnalyzerResources:
+    """
+    The immutable, shareable half of HealthCoachAgent: compiled pattern
+    registry, lexicon automaton and response catalog, plus an analysis
+    cache (results depend only on the text, so every session can share
+    it). Per-user state (memory, context, RNG) stays on the agent.
+    """
+
+    __slots__ = ("patterns", "lexicon", "responses", "analysis_cache")
+
+    def __init__(self, patterns=PATTERNS, lexicon=LEXICON, responses=RESPONSES,
+                 cache_size: int = SHARED_CACHE_SIZE):
+        self.patterns = patterns
+        self.lexicon = lexicon
+        self.responses = responses
+        self.analysis_cache = AnalysisCache(cache_size)
+
+
+@lru_cache(maxsize=None)
+def get_shared_resources() -> AnalyzerResources:
+    """Process-wide resources, built on first use and shared read-only."""
+    return AnalyzerResources()
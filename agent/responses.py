@@ -0,0 +1,213 @@
+from string import Formatter
+
+
+# ---------- TEMPLATE SOURCES ----------
+# Conversational framing (friend energy)
+OPENERS = [
+    "Hey, I’m really glad you said that.",
+    "Alright, pause with me for a second.",
+    "I hear you — and I’m not brushing this off.",
+    "Thanks for trusting me with this.",
+    "I’m right here with you."
+]
+
+REFLECTIONS = [
+    "What you’re describing feels heavy.",
+    "That sounds like it’s been sitting with you for a while.",
+    "Anyone in your place would feel shaken.",
+    "That’s not a small thing to carry.",
+    "It makes sense that this is affecting you."
+]
+
+GENTLE_QUESTIONS = [
+    "Do you want to talk about what started this?",
+    "What part of this hurts the most right now?",
+    "Has this been building up for days, or did something happen today?",
+    "What’s been looping in your head lately?",
+    "If you had words for the feeling, what would they be?"
+]
+
+GROUNDING_LINES = [
+    "Take a slow breath with me for a moment.",
+    "You don’t have to solve everything right now.",
+    "We can take this one step at a time.",
+    "You’re not weak for feeling this way.",
+    "I’m not going anywhere."
+]
+
+POSITIVE_FOLLOWUPS = [
+    "Tell me more — I’m genuinely curious.",
+    "What made you think about this just now?",
+    "How are you feeling about it in this exact moment?",
+    "That sounds meaningful to you.",
+    "I like the way you’re thinking about this."
+]
+
+# Mood-specific bodies; {keywords} is filled with the turn's keywords
+SAD_TEMPLATES = [
+    "I hear you. Feeling {keywords} can be really heavy.",
+    "Your feelings are valid. {keywords} must be hard to go through.",
+    "I’m here with you. Can you tell me more about {keywords}?",
+    "It’s okay to feel this way. {keywords} can really weigh on the heart.",
+    "I understand. Experiencing {keywords} can be exhausting emotionally.",
+    "Thank you for sharing about {keywords}. I can see why it feels difficult.",
+    "I can imagine how {keywords} might make things challenging for you.",
+    "Feeling {keywords} is natural. Let’s take it one step at a time together.",
+    "I’m listening. {keywords} sounds like it’s been tough on you lately.",
+    "It sounds like {keywords} is really affecting you. I’m here to understand.",
+    "I know it’s not easy to talk about {keywords}, but you’re doing great by sharing.",
+    "Sometimes {keywords} can feel overwhelming. I’m here to help process it.",
+    "You’re not alone in feeling {keywords}. Let’s explore this together.",
+    "I can feel the weight of {keywords} in what you’re saying. Tell me more if you can.",
+    "Talking about {keywords} takes courage. I’m glad you shared it with me.",
+    "Thank you for trusting me with your thoughts about {keywords}. I’m here for you.",
+    "I notice {keywords} is significant for you. Let’s discuss how it impacts your life.",
+    "Feeling {keywords} is part of the human experience, and I want to support you through it.",
+    "I hear the sadness in {keywords}. You can share more if you feel comfortable.",
+    "It’s okay that {keywords} is bothering you. We can unpack this together."
+]
+
+STRESS_TEMPLATES = [
+    "Stress can weigh heavily on anyone. Let’s carefully think through {keywords} together and find some clarity.",
+    "I hear that {keywords} is causing tension. It's completely normal to feel this way. Can you share more details?",
+    "Take a slow, deep breath. {keywords} might feel overwhelming now, but we can explore it step by step.",
+    "I understand that {keywords} is stressful. Sometimes naming it out loud helps. What part of {keywords} feels hardest?",
+    "It’s okay to feel overwhelmed by {keywords}. Let’s focus on what you can control and ease the pressure gradually.",
+    "Stress often comes from many layers. {keywords} might be one of them. Can you tell me what’s most pressing?",
+    "You’re not alone feeling stressed about {keywords}. Let’s break it down together and see what might help.",
+    "I notice {keywords} is creating tension. Reflecting on it can bring insight. What thoughts come to mind when you think about it?",
+    "Feeling stressed is a signal from your mind and body. {keywords} is important to discuss. Can you describe your feelings more?",
+    "Sometimes stress clouds our perspective. Talking about {keywords} can help release some of that weight. How does it make you feel physically?",
+    "Let’s approach {keywords} gently. You deserve calm and understanding as we work through it together.",
+    "I’m here with you while you process {keywords}. Naming your stress is the first step to finding balance.",
+    "Acknowledging stress is brave. {keywords} might feel heavy now, but together we can find small ways to relieve it.",
+    "Let’s explore {keywords} from different angles. What part of it triggers the strongest reaction in you?",
+    "It’s okay if {keywords} feels like too much. We can take small steps to untangle this stress slowly."
+]
+
+POSITIVE_TEMPLATES = [
+    "Thanks for sharing. {keywords} sounds interesting, tell me more.",
+    "I’m glad you told me that. What else about {keywords}?",
+    "I’m listening carefully. How does {keywords} make you feel?",
+    "Nice! Good going, {keywords} sounds interesting.",
+    "That’s really insightful. Can you elaborate more on {keywords}?",
+    "I appreciate you opening up about {keywords}. How does it affect your day-to-day?",
+    "It’s great that you mentioned {keywords}. What emotions come with it?",
+    "Wow, {keywords} seems important. Let’s explore that together.",
+    "Your thoughts on {keywords} are valuable. Tell me more.",
+    "I hear you about {keywords}. How does it influence your current mood?",
+    "Interesting perspective on {keywords}. How long have you felt this way?",
+    "I’m curious about your experience with {keywords}. Can you describe it further?",
+    "It sounds like {keywords} matters a lot to you. Let’s discuss more.",
+    "Thanks for sharing your view on {keywords}. How does it impact you?",
+    "I can see why {keywords} would be significant. Let’s unpack it a bit."
+]
+
+CRISIS_RESPONSES = [
+    (
+        "I’m really glad you told me how you’re feeling. What you’re going through sounds overwhelming, "
+        "and you don’t have to face it alone.\n\n"
+        "You deserve care, understanding, and real support. If you can, please consider reaching out "
+        "to someone you trust right now—a close friend, a family member, or a mental health professional.\n\n"
+        "If you feel in immediate danger, please contact your local emergency number or a suicide prevention "
+        "hotline in your country.\n\n"
+        "You matter. Your life has value. I’m here with you, and I’m listening."
+    ),
+    (
+        "Thank you for trusting me with something this heavy. I can hear how much pain you’re in, "
+        "and it’s important to take this seriously.\n\n"
+        "You deserve help and compassion, not judgment. Please reach out to someone who can be with you "
+        "right now—whether that’s a loved one or a trained professional.\n\n"
+        "If there’s any immediate risk, please call your local emergency services or a crisis hotline.\n\n"
+        "You are not weak for needing help. You are human, and your life matters."
+    ),
+    (
+        "I’m really sorry that you’re feeling this way, and I’m glad you spoke up. These feelings can be "
+        "incredibly intense, but they don’t define your worth or your future.\n\n"
+        "It’s important to get real-time support. Please consider contacting someone you trust or a mental "
+        "health professional as soon as possible.\n\n"
+        "If you’re in immediate danger, please call your emergency number or a suicide prevention hotline.\n\n"
+        "You are important. You deserve to be here. I’m staying with you and taking you seriously."
+    ),
+    (
+        "I hear you, and I’m really glad you reached out. What you’re experiencing is serious, and you "
+        "deserve care, safety, and support.\n\n"
+        "Please try to connect with someone right now—a friend, family member, or counselor—so you don’t "
+        "have to hold this alone.\n\n"
+        "If you feel unsafe, please contact local emergency services or a crisis hotline immediately.\n\n"
+        "Your life has meaning, even if it doesn’t feel that way right now. I’m here with you."
+    )
+]
+
+
+# ---------- PRE-PARSED TEMPLATES ----------
+class Template:
+    """
+    A response template split once into its literal segments.
+
+    The only supported field is {keywords}, so rendering is a single
+    str.join of the segments instead of a str.format parse per turn.
+    """
+
+    __slots__ = ("source", "segments")
+
+    def __init__(self, source: str):
+        self.source = source
+        segments = [""]
+        for literal, field, spec, conversion in Formatter().parse(source):
+            segments[-1] += literal
+            if field is None:
+                continue
+            if field != "keywords" or spec or conversion:
+                raise ValueError(f"unsupported template field {{{field}}} in {source!r}")
+            segments.append("")
+        self.segments = tuple(segments)
+
+    def render(self, keywords: str = "") -> str:
+        return keywords.join(self.segments)
+
+
+class ResponseCatalog:
+    """
+    All response templates, loaded and parsed once per process.
+
+    Selection is by index from a caller-supplied random.Random, so each
+    agent can carry its own (optionally seeded) generator and replays are
+    reproducible.
+    """
+
+    def __init__(self, groups: dict, fallbacks: dict = None):
+        self.groups = {
+            name: tuple(Template(source) for source in sources)
+            for name, sources in groups.items()
+        }
+        # Filler used when a turn produced no keywords
+        self.fallbacks = fallbacks or {}
+
+    def pick(self, group: str, rng) -> Template:
+        templates = self.groups[group]
+        return templates[rng.randrange(len(templates))]
+
+    def line(self, group: str, rng) -> str:
+        """A fixed line (no fields) from group."""
+        return self.pick(group, rng).source
+
+    def render(self, group: str, rng, keywords) -> str:
+        filler = ", ".join(keywords) if keywords else self.fallbacks.get(group, "")
+        return self.pick(group, rng).render(filler)
+
+
+RESPONSES = ResponseCatalog(
+    {
+        "openers": OPENERS,
+        "reflections": REFLECTIONS,
+        "gentle_questions": GENTLE_QUESTIONS,
+        "grounding_lines": GROUNDING_LINES,
+        "positive_followups": POSITIVE_FOLLOWUPS,
+        "sad": SAD_TEMPLATES,
+        "stress": STRESS_TEMPLATES,
+        "positive": POSITIVE_TEMPLATES,
+        "crisis": CRISIS_RESPONSES,
+    },
+    fallbacks={"sad": "this", "stress": "everything", "positive": "that"},
+)
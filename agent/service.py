@@ -0,0 +1,216 @@
+"""
+Lightweight HTTP service around HealthCoachAgent (plain ASGI, no framework).
+
+    POST /reply          {"session_id": "...", "text": "..."}
+    POST /analyze        {"text": "..."}
+    POST /analyze_batch  {"texts": ["...", ...]}
+    GET  /report?session_id=...
+    GET  /healthz
+
+Each session gets its own agent, kept in memory and evicted after
+SESSION_IDLE_SECONDS without traffic. Sessions live in the worker process
+that served them, so put a sticky load balancer (by session_id) in front
+when running more than one worker:
+
+    python -m agent.service --workers 4 --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from agent.coach_agent import HealthCoachAgent
+
+
+SESSION_IDLE_SECONDS = 30 * 60
+MAX_SESSIONS = 10_000
+MAX_BODY_BYTES = 1 << 20
+MAX_BATCH = 10_000
+
+
+# ---------- SESSIONS ----------
+class SessionStore:
+    """
+    Per-session agents in least-recently-used order. Idle sessions are
+    evicted lazily on access; MAX_SESSIONS caps the total regardless.
+    """
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS, max_sessions: int = MAX_SESSIONS):
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session_id -> [agent, last_seen]
+        self.evictions = 0
+
+    def get(self, session_id: str, create: bool = True):
+        now = time.monotonic()
+        self.evict_idle(now)
+
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            if not create:
+                return None
+            entry = self._sessions[session_id] = [HealthCoachAgent(), now]
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        else:
+            entry[1] = now
+            self._sessions.move_to_end(session_id)
+        return entry[0]
+
+    def evict_idle(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        while self._sessions:
+            session_id, (agent, last_seen) = next(iter(self._sessions.items()))
+            if now - last_seen < self.idle_seconds:
+                break
+            del self._sessions[session_id]
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+sessions = SessionStore()
+# Stateless analysis shares one agent (no memory is touched)
+analyzer = HealthCoachAgent()
+
+
+# ---------- HTTP PLUMBING ----------
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def _read_json(receive) -> dict:
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPError(413, "request body too large")
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "body must be JSON")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "body must be a JSON object")
+    return data
+
+
+async def _send_json(send, status: int, payload: dict):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _require_str(data: dict, field: str) -> str:
+    value = data.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise HTTPError(400, f"'{field}' must be a non-empty string")
+    return value
+
+
+# ---------- ENDPOINTS ----------
+async def handle_reply(data: dict) -> dict:
+    session_id = _require_str(data, "session_id")
+    agent = sessions.get(session_id)
+    reply = await agent.reply_async(_require_str(data, "text"))
+    return {"session_id": session_id, "reply": reply}
+
+
+async def handle_analyze(data: dict) -> dict:
+    return analyzer.analyze(_require_str(data, "text"))
+
+
+async def handle_analyze_batch(data: dict) -> dict:
+    texts = data.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        raise HTTPError(400, "'texts' must be a list of strings")
+    if len(texts) > MAX_BATCH:
+        raise HTTPError(413, f"at most {MAX_BATCH} texts per batch")
+    # Off the event loop so a big batch doesn't stall every other session
+    return {"results": await asyncio.to_thread(analyzer.analyze_batch, texts)}
+
+
+async def handle_report(query: dict) -> dict:
+    session_id = (query.get("session_id") or [""])[0]
+    agent = sessions.get(session_id, create=False) if session_id else None
+    if agent is None:
+        raise HTTPError(404, "unknown session_id")
+    return {"session_id": session_id, "report": agent.generate_report()}
+
+
+POST_ROUTES = {
+    "/reply": handle_reply,
+    "/analyze": handle_analyze,
+    "/analyze_batch": handle_analyze_batch,
+}
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    try:
+        if path in POST_ROUTES:
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            payload = await POST_ROUTES[path](await _read_json(receive))
+        elif path == "/report":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            payload = await handle_report(parse_qs(scope.get("query_string", b"").decode()))
+        elif path == "/healthz":
+            payload = {"status": "ok", "sessions": len(sessions)}
+        else:
+            raise HTTPError(404, "not found")
+    except HTTPError as e:
+        await _send_json(send, e.status, {"error": e.message})
+        return
+
+    await _send_json(send, 200, payload)
+
+
+# ---------- ENTRY POINT ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m agent.service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run(
+        "agent.service:app", host=args.host, port=args.port,
+        workers=args.workers, lifespan="on", access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from agent.memory import MOOD_CODES, MOODS, URGENCY_CODES, URGENCIES
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    mood INTEGER NOT NULL,
+    urgency INTEGER NOT NULL,
+    keywords TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_turns_session_ts ON turns (session_id, ts);
+
+CREATE TABLE IF NOT EXISTS turn_keywords (
+    session_id TEXT NOT NULL,
+    keyword TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_turn_keywords_session ON turn_keywords (session_id, keyword);
+"""
+
+
+class ConversationStore:
+    """
+    Durable SQLite (WAL) store for conversation turns.
+
+    record() only appends to an in-memory buffer; turns reach the database
+    in one transaction per batch, when the buffer holds `batch_size` turns
+    or is older than `flush_interval` seconds (a background thread covers
+    quiet periods). Reads flush first, so they always see every turn.
+
+    A failed write keeps its turns buffered for the next attempt; record()
+    and the background thread log the error instead of raising it.
+
+    One store is meant to be shared by all sessions in a process.
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, flush_interval: float = 2.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._oldest = None
+
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="coach-store-flush", daemon=True)
+        self._flusher.start()
+
+    # ---------- WRITES ----------
+    def record(self, session_id: str, text: str, mood: str, urgency: str, keywords,
+               timestamp: int = None):
+        row = (
+            session_id,
+            int(time.time()) if timestamp is None else int(timestamp),
+            text, MOOD_CODES[mood], URGENCY_CODES[urgency], list(keywords),
+        )
+        with self._lock:
+            self._buffer.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._buffer) >= self.batch_size:
+                # The turn is buffered either way; a failed write is retried
+                try:
+                    self._flush_locked()
+                except Exception:
+                    logger.exception("could not write %d buffered turns to %s", len(self._buffer), self.path)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        rows, oldest = self._buffer, self._oldest
+        self._buffer, self._oldest = [], None
+        conn = self._conn
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO turns (session_id, ts, text, mood, urgency, keywords) VALUES (?, ?, ?, ?, ?, ?)",
+                [(s, ts, text, m, u, json.dumps(kw)) for s, ts, text, m, u, kw in rows],
+            )
+            conn.executemany(
+                "INSERT INTO turn_keywords (session_id, keyword) VALUES (?, ?)",
+                [(s, kw) for s, _, _, _, _, kws in rows for kw in kws],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._buffer[:0] = rows
+            self._oldest = oldest
+            raise
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval / 2):
+            with self._lock:
+                if self._oldest is None or time.monotonic() - self._oldest < self.flush_interval:
+                    continue
+                try:
+                    self._flush_locked()
+                except Exception:
+                    logger.exception("could not write %d buffered turns to %s", len(self._buffer), self.path)
+
+    def close(self):
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                self._conn.close()
+
+    # ---------- READS ----------
+    def _query(self, sql: str, params: tuple) -> list:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(sql, params).fetchall()
+
+    def recent_turns(self, session_id: str, limit: int = 20) -> list:
+        """The last `limit` turns of a session, oldest first, as dicts."""
+        rows = self._query(
+            "SELECT ts, text, mood, urgency, keywords FROM turns "
+            "WHERE session_id = ? ORDER BY ts DESC, id DESC LIMIT ?",
+            (session_id, limit),
+        )
+        return [self._turn(row) for row in reversed(rows)]
+
+    def turns_between(self, session_id: str, start_ts: int, end_ts: int) -> list:
+        rows = self._query(
+            "SELECT ts, text, mood, urgency, keywords FROM turns "
+            "WHERE session_id = ? AND ts >= ? AND ts < ? ORDER BY ts, id",
+            (session_id, start_ts, end_ts),
+        )
+        return [self._turn(row) for row in rows]
+
+    def turn_count(self, session_id: str) -> int:
+        return self._query("SELECT COUNT(*) FROM turns WHERE session_id = ?", (session_id,))[0][0]
+
+    def mood_counts(self, session_id: str) -> dict:
+        counts = dict.fromkeys(MOODS, 0)
+        for code, n in self._query(
+            "SELECT mood, COUNT(*) FROM turns WHERE session_id = ? GROUP BY mood", (session_id,)
+        ):
+            counts[MOODS[code]] = n
+        return counts
+
+    def urgency_counts(self, session_id: str) -> dict:
+        counts = dict.fromkeys(URGENCIES, 0)
+        for code, n in self._query(
+            "SELECT urgency, COUNT(*) FROM turns WHERE session_id = ? GROUP BY urgency", (session_id,)
+        ):
+            counts[URGENCIES[code]] = n
+        return counts
+
+    def top_keywords(self, session_id: str, k: int = 10) -> list:
+        """[(keyword, count)] most frequent first."""
+        return self._query(
+            "SELECT keyword, COUNT(*) AS n FROM turn_keywords WHERE session_id = ? "
+            "GROUP BY keyword ORDER BY n DESC, keyword LIMIT ?",
+            (session_id, k),
+        )
+
+    @staticmethod
+    def _turn(row) -> dict:
+        # Same keys as memory.Turn, so resumed and live context entries match
+        ts, text, mood, urgency, keywords = row
+        return {
+            "text": text,
+            "mood": MOODS[mood],
+            "urgency": URGENCIES[urgency],
+            "keywords": json.loads(keywords),
+            "time": datetime.fromtimestamp(ts).strftime("%H:%M"),
+        }
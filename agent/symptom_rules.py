@@ -0,0 +1,175 @@
+import re
+from functools import lru_cache
+
+from agent.fuzzy import TrigramIndex
+from agent.lexicon import KeywordAutomaton
+
+
+# ---------- RULE TABLE ----------
+# The rule table lives in symptom_rules.json and is compiled by
+# agent.knowledge_base. Each rule fires when every group in `requires`
+# has at least one of its terms somewhere in the symptom text. When
+# several rules fire, the higher risk wins; ties go to table order.
+
+RISK_PRIORITY = {"high": 0, "medium": 1, "low": 2, "unknown": 3}
+
+# Dice similarity a misspelt word (or run of words) needs to count as a
+# rule term: "feever" -> "fever" (0.77), "chestpain" -> "chest pain" (1.0)
+FUZZY_THRESHOLD = 0.7
+WORD_RE = re.compile(r"[a-z0-9]+")
+CLAUSE_RE = re.compile(r"[.,;:\n]")
+
+# Fuzzy lookups cost tens of microseconds each against a large table, so
+# an assessment makes at most this many, and never for a window that
+# starts or ends with one of these words
+MAX_FUZZY_LOOKUPS = 24
+STOPWORDS = frozenset({
+    "i", "im", "ive", "me", "my", "am", "is", "are", "was", "were", "be", "been",
+    "have", "has", "had", "do", "does", "did", "a", "an", "the", "and", "or", "but",
+    "so", "of", "to", "in", "on", "at", "for", "with", "from", "since", "when",
+    "it", "its", "this", "that", "there", "some", "very", "really", "just", "also",
+    "feel", "feels", "feeling", "got", "get", "getting", "like", "all", "even",
+})
+
+
+# ---------- ENGINE ----------
+class SymptomRuleEngine:
+    """
+    Rule table compiled into an inverted index (term -> rules using it).
+
+    One automaton pass finds every rule term in the text; only rules that
+    share a term with the input are checked, in priority order, so the
+    cost tracks the input rather than the size of the table.
+
+    `rules` only needs "requires" and "risk". The displayed fields come
+    from `payloads[i]` (default: the rules themselves), which is read
+    only for the rule that wins, so it can be a lazy on-disk sequence.
+
+    Terms are found exactly (automaton) and, with a fuzzy_threshold, also
+    through a trigram index over the term vocabulary, looked up for short
+    runs of input words that no exact hit already explains (at most
+    MAX_FUZZY_LOOKUPS per text).
+    """
+
+    def __init__(self, rules: list, fallback: dict, payloads=None,
+                 fuzzy_threshold: float = FUZZY_THRESHOLD):
+        # Priority order: risk first, then table order (sort is stable)
+        self.order = sorted(
+            range(len(rules)),
+            key=lambda i: RISK_PRIORITY.get(rules[i]["risk"], len(RISK_PRIORITY)),
+        )
+        self.payloads = rules if payloads is None else payloads
+        self.fallback = fallback
+
+        terms = sorted({t for rule in rules for group in rule["requires"] for t in group})
+        self.automaton = KeywordAutomaton({"terms": terms})
+        term_ids = {term: i for i, term in enumerate(self.automaton.words)}
+
+        self.fuzzy_threshold = fuzzy_threshold
+        self._term_ids = term_ids
+        self._max_words = max((len(t.split()) for t in terms), default=0)
+        # term id -> its words; spaceless form -> term id ("chestpain")
+        self._term_words = [frozenset(WORD_RE.findall(t)) for t in self.automaton.words]
+        self._spaceless = {"".join(WORD_RE.findall(t)): i for i, t in enumerate(self.automaton.words)}
+        if fuzzy_threshold:
+            fuzzy = TrigramIndex(self.automaton.words)
+            self._fuzzy_best = lru_cache(maxsize=4096)(
+                lambda window: fuzzy.best(window, fuzzy_threshold)
+            )
+
+        # priority position -> risk rank
+        self._ranks = [
+            RISK_PRIORITY.get(rules[i]["risk"], len(RISK_PRIORITY)) for i in self.order
+        ]
+        # priority position -> required groups as sets of term ids
+        self._groups = [
+            tuple(frozenset(term_ids[t] for t in group) for group in rules[i]["requires"])
+            for i in self.order
+        ]
+        # term id -> priority positions of the rules that mention it
+        index = [set() for _ in self.automaton.words]
+        for position, groups in enumerate(self._groups):
+            for group in groups:
+                for term_id in group:
+                    index[term_id].add(position)
+        self._term_rules = [tuple(positions) for positions in index]
+
+    def find_terms(self, symptoms: str) -> set:
+        """Ids of the rule terms present in the text, exactly or nearly."""
+        text = symptoms.lower()
+        found = self.automaton.scan(text)
+        if not self.fuzzy_threshold:
+            return found
+
+        # Words that are part of an exact hit need no second look
+        covered = set()
+        for term_id in found:
+            covered.update(self._term_words[term_id])
+
+        # Runs of up to max_words words within one clause, joined without
+        # spaces, so a missing space ("chestpain") or an extra one
+        # ("head ache") matches but "chest. pain" across clauses doesn't
+        lookups = 0
+        for clause in CLAUSE_RE.split(text):
+            words = WORD_RE.findall(clause)
+            for n in range(1, self._max_words + 1):
+                for i in range(len(words) - n + 1):
+                    run = words[i:i + n]
+                    if run[0] in STOPWORDS or run[-1] in STOPWORDS or not covered.isdisjoint(run):
+                        continue
+                    window = "".join(run)
+                    if len(window) < 4:
+                        continue
+                    term_id = self._spaceless.get(window)
+                    if term_id is None:
+                        if lookups == MAX_FUZZY_LOOKUPS:
+                            continue
+                        lookups += 1
+                        term = self._fuzzy_best(window)
+                        if term is None:
+                            continue
+                        term_id = self._term_ids[term]
+                    found.add(term_id)
+        return found
+
+    # ---------- PER-RULE ACCESS (incremental scoring) ----------
+    def rules_for(self, term_ids) -> set:
+        """Priority positions of the rules that mention any of the terms."""
+        positions = set()
+        for term_id in term_ids:
+            positions.update(self._term_rules[term_id])
+        return positions
+
+    def coverage(self, position: int, found: set) -> float:
+        """Fraction of a rule's required groups satisfied by `found`."""
+        groups = self._groups[position]
+        return sum(1 for group in groups if group & found) / len(groups)
+
+    def rank(self, position: int) -> int:
+        return self._ranks[position]
+
+    def payload(self, position: int) -> dict:
+        return self.payloads[self.order[position]]
+
+    def matches(self, symptoms: str) -> list:
+        """Table indexes of every rule that fires, highest priority first."""
+        found = self.find_terms(symptoms)
+        candidates = set()
+        for term_id in found:
+            candidates.update(self._term_rules[term_id])
+        return [
+            self.order[position]
+            for position in sorted(candidates)
+            if all(group & found for group in self._groups[position])
+        ]
+
+    def assess(self, symptoms: str) -> dict:
+        """{condition, questions, risk, advice}, as the Diagnosis page renders it."""
+        matched = self.matches(symptoms)
+        rule = self.payloads[matched[0]] if matched else self.fallback
+        return {
+            "condition": rule["condition"],
+            "questions": list(rule["questions"]),
+            "risk": rule["risk"],
+            "advice": list(rule["advice"]),
+        }
@@ -0,0 +1,145 @@
+class _Bucket:
+    __slots__ = ("count", "keys", "prev", "next")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.keys = {}  # insertion-ordered set
+        self.prev = None
+        self.next = None
+
+
+class KeywordIndex:
+    """
+    Incremental keyword frequency index with O(1) updates and O(k) top-k.
+
+    Keys sit in buckets of equal count, linked in ascending count order
+    (the "stream summary" layout), so top() walks down from the highest
+    bucket and never touches the rest of the vocabulary.
+
+    capacity=None keeps exact counts for every keyword. With a capacity
+    the index becomes a Space-Saving heavy-hitters sketch: memory is
+    bounded to `capacity` keywords, and when a new keyword arrives at a
+    full index it replaces one of the least frequent ones, inheriting its
+    count. Reported counts can then overestimate by at most error(key).
+    """
+
+    def __init__(self, capacity: int = None):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be a positive integer or None")
+        self.capacity = capacity
+        self.total = 0
+        self._where = {}
+        self._errors = {}
+        self._head = None  # lowest count
+        self._tail = None  # highest count
+
+    # ---------- UPDATES ----------
+    def add(self, key: str):
+        self.total += 1
+        bucket = self._where.get(key)
+        if bucket is not None:
+            self._move_up(key, bucket)
+            return
+
+        if self.capacity is None or len(self._where) < self.capacity:
+            self._insert_new(key, count=1, error=0)
+            return
+
+        # Space-Saving: evict the oldest key of the lowest bucket
+        low = self._head
+        victim = next(iter(low.keys))
+        self._remove(victim, low)
+        del self._errors[victim]
+        self._insert_new(key, count=low.count + 1, error=low.count)
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    # ---------- QUERIES ----------
+    def top(self, k: int = 10) -> list:
+        """[(keyword, count)] for the k most frequent keywords, highest first."""
+        result = []
+        bucket = self._tail
+        while bucket is not None and len(result) < k:
+            for key in bucket.keys:
+                result.append((key, bucket.count))
+                if len(result) == k:
+                    break
+            bucket = bucket.prev
+        return result
+
+    def count(self, key: str) -> int:
+        bucket = self._where.get(key)
+        return bucket.count if bucket is not None else 0
+
+    def error(self, key: str) -> int:
+        """Upper bound on how much count(key) may overestimate (sketch mode)."""
+        return self._errors.get(key, 0)
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    # ---------- BUCKET LIST ----------
+    def _insert_new(self, key: str, count: int, error: int):
+        # New keys land at or just above the lowest bucket
+        bucket = self._head
+        if bucket is not None and bucket.count == count:
+            target = bucket
+        elif bucket is not None and bucket.count < count:
+            target = bucket.next if bucket.next is not None and bucket.next.count == count else None
+            if target is None:
+                target = self._link_after(bucket, count)
+        else:
+            target = self._link_after(None, count)
+        target.keys[key] = None
+        self._where[key] = target
+        self._errors[key] = error
+
+    def _move_up(self, key: str, bucket: _Bucket):
+        nxt = bucket.next
+        if nxt is None or nxt.count != bucket.count + 1:
+            nxt = self._link_after(bucket, bucket.count + 1)
+        del bucket.keys[key]
+        nxt.keys[key] = None
+        self._where[key] = nxt
+        if not bucket.keys:
+            self._unlink(bucket)
+
+    def _remove(self, key: str, bucket: _Bucket):
+        del bucket.keys[key]
+        del self._where[key]
+        if not bucket.keys:
+            self._unlink(bucket)
+
+    def _link_after(self, bucket, count: int) -> _Bucket:
+        """New bucket after `bucket` (or at the head when bucket is None)."""
+        new = _Bucket(count)
+        if bucket is None:
+            new.next = self._head
+            if self._head is not None:
+                self._head.prev = new
+            self._head = new
+            if self._tail is None:
+                self._tail = new
+        else:
+            new.prev, new.next = bucket, bucket.next
+            if bucket.next is not None:
+                bucket.next.prev = new
+            else:
+                self._tail = new
+            bucket.next = new
+        return new
+
+    def _unlink(self, bucket: _Bucket):
+        if bucket.prev is not None:
+            bucket.prev.next = bucket.next
+        else:
+            self._head = bucket.next
+        if bucket.next is not None:
+            bucket.next.prev = bucket.prev
+        else:
+            self._tail = bucket.prev
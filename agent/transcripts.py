@@ -0,0 +1,192 @@
+"""
+Offline transcript analysis.
+
+Scores a JSONL archive of chat turns with the same analyzers the coach
+uses live (mood, urgency, keywords). Work is chunked and spread across a
+process pool; results are written back in input order.
+
+    python -m agent.transcripts archive.jsonl -o scored.jsonl --workers 8
+
+With --stream, one user's history is replayed turn by turn instead: each
+record also carries the rolling context signals the coach would have seen,
+and memory stays flat however long the input is.
+
+    cat history.jsonl | python -m agent.transcripts - --stream
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from agent.coach_agent import HealthCoachAgent
+
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+# ---------- WORKER SIDE ----------
+_worker_agent = None
+
+
+def _init_worker():
+    global _worker_agent
+    _worker_agent = HealthCoachAgent()
+
+
+def _parse_line(line: str, field: str) -> dict:
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict) or not isinstance(record.get(field), str):
+            raise ValueError(f"missing '{field}' string")
+    except ValueError as e:
+        record = {"raw": line.rstrip("\n"), "error": str(e)}
+    return record
+
+
+def analyze_lines(lines: list, field: str = "text") -> str:
+    """
+    Score one chunk of raw JSONL lines and return the output JSONL block.
+    Every input line yields exactly one output line.
+    """
+    agent = _worker_agent or HealthCoachAgent()
+
+    records = [_parse_line(line, field) for line in lines]
+    valid = [r for r in records if "error" not in r]
+    for record, result in zip(valid, agent.analyze_batch([r[field] for r in valid])):
+        record.update(result)
+
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+
+# ---------- DRIVER SIDE ----------
+def iter_chunks(lines, chunk_size: int):
+    """Group non-blank lines into lists of chunk_size."""
+    lines = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(pool, fn, iterable, max_pending: int):
+    """
+    Like pool.map, but keeps at most max_pending tasks in flight so the
+    input is never read ahead into memory. Results come back in order.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class _FieldTask:
+    """Picklable analyze_lines(chunk, field) for the pool."""
+
+    def __init__(self, field: str):
+        self.field = field
+
+    def __call__(self, lines: list) -> str:
+        return analyze_lines(lines, self.field)
+
+
+def run(infile, outfile, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        field: str = "text") -> int:
+    """Score every line of infile into outfile. Returns lines written."""
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(infile, chunk_size)
+    written = 0
+
+    if workers == 1:
+        _init_worker()
+        for chunk in chunks:
+            block = analyze_lines(chunk, field)
+            outfile.write(block)
+            written += len(chunk)
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for block in ordered_map(pool, _FieldTask(field), chunks, max_pending=workers * 2):
+            outfile.write(block)
+            written += block.count("\n")
+    return written
+
+
+# ---------- STREAMING REPLAY ----------
+def stream_analyses(lines, field: str = "text", agent: HealthCoachAgent = None):
+    """
+    Lazily yield one analysis record per turn.
+
+    Turns are never added to agent.memory; only the bounded context_memory
+    window is rebuilt, so the repeated_sadness / repeated_stress signals
+    match what reply() would have seen at that point in the history.
+    """
+    agent = agent or HealthCoachAgent()
+
+    for line in lines:
+        if not line.strip():
+            continue
+        record = _parse_line(line, field)
+        if "error" in record:
+            yield record
+            continue
+
+        record.update(agent.analyze(record[field]))
+        agent.update_context({"mood": record["mood"], "urgency": record["urgency"]})
+        record.update(agent.context_signals())
+        yield record
+
+
+def run_stream(infile, outfile, field: str = "text") -> int:
+    """Replay infile through stream_analyses, writing each record as it lands."""
+    written = 0
+    for record in stream_analyses(infile, field):
+        outfile.write(json.dumps(record, ensure_ascii=False) + "\n")
+        outfile.flush()
+        written += 1
+    return written
+
+
+# ---------- CLI ----------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m agent.transcripts",
+        description="Score a JSONL archive of chat turns with the coach analyzers."
+    )
+    parser.add_argument("input", help="JSONL file of chat turns, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="lines per task sent to a worker")
+    parser.add_argument("--field", default="text", help="JSON field holding the message text")
+    parser.add_argument("--stream", action="store_true",
+                        help="replay turns in order with rolling context, one record at a time")
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        if args.stream:
+            written = run_stream(infile, outfile, args.field)
+        else:
+            written = run(infile, outfile, args.workers, args.chunk_size, args.field)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    print(f"scored {written} lines", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Micro- and macro-benchmarks for agent/coach_agent.py.
+
+Micro: TextFeatures construction (tokenizing + lexicon scan), then
+detect_mood, detect_urgency, extract_keywords and
+philosophical_sentiment_heuristic on prebuilt features, over synthetic
+corpora of short, medium and long messages in three mood mixes.
+Macro: full reply() and generate_report() over conversations of 10, 1k
+and 100k turns.
+
+    python -m benchmarks.bench_agent --save benchmarks/baseline.json
+    python -m benchmarks.bench_agent --compare benchmarks/baseline.json --threshold 1.25
+
+Every figure is the fastest of --repeat samples. Micro samples loop
+over the corpus as many times as it takes to fill MIN_SAMPLE_SECONDS
+(like timeit's autorange); each reply() sample replays the whole
+conversation on a fresh agent. The garbage collector is paused while a
+sample runs, as timeit does.
+
+--compare exits with status 1 if any benchmark is slower than
+threshold x its baseline time and also more than --noise-floor slower,
+so sub-microsecond entries can't fail the gate on jitter alone.
+--quick skips the 100k-turn conversation.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+
+from agent.coach_agent import HealthCoachAgent
+from agent.features import TextFeatures
+from agent.lexicon import LEXICONS
+from agent.patterns import PATTERN_SOURCES
+from agent.resources import AnalyzerResources
+
+
+# ---------- SYNTHETIC CORPORA ----------
+MESSAGE_LENGTHS = {"short": 6, "medium": 25, "long": 90}
+
+FILLER = (
+    "today work my family friend the and it was really just so very "
+    "feel think day week sleep exam job home time people again still"
+).split()
+
+# Share of words drawn from each vocabulary family
+MOOD_MIXES = {
+    "balanced": {"distress": 0.1, "stress": 0.1, "positive": 0.1},
+    "distressed": {"distress": 0.3, "stress": 0.15, "positive": 0.02},
+    "positive": {"distress": 0.01, "stress": 0.04, "positive": 0.3},
+}
+
+
+def _plain(pattern: str) -> str:
+    return pattern.replace(r"\b", "")
+
+
+VOCAB = {
+    "distress": (
+        [_plain(p) for name in ("explicit_intent", "passive_death", "hopelessness",
+                                "self_worth", "sad", "urgency_high_risk")
+         for p in PATTERN_SOURCES[name]]
+        + LEXICONS["pain_intensity"] + LEXICONS["hopeless"] + LEXICONS["negative"]
+    ),
+    "stress": (
+        [_plain(p) for p in PATTERN_SOURCES["stress"]]
+        + LEXICONS["overload"] + LEXICONS["helpless"] + LEXICONS["absolutist"]
+    ),
+    "positive": (
+        [_plain(p) for name in ("happy", "positive_phrase", "connection", "wellbeing")
+         for p in PATTERN_SOURCES[name]]
+        + LEXICONS["low_positive"] + LEXICONS["positive"] + LEXICONS["control"]
+    ),
+}
+
+
+def make_message(rng: random.Random, length: int, mix: dict) -> str:
+    words = []
+    while len(words) < length:
+        roll = rng.random()
+        for family, share in mix.items():
+            if roll < share:
+                words.extend(rng.choice(VOCAB[family]).split())
+                break
+            roll -= share
+        else:
+            words.append(rng.choice(FILLER))
+    return " ".join(words[:length])
+
+
+def make_corpus(size: int, length: str, mix: str, seed: int = 0) -> list:
+    rng = random.Random(f"{seed}-{length}-{mix}")
+    return [make_message(rng, MESSAGE_LENGTHS[length], MOOD_MIXES[mix]) for _ in range(size)]
+
+
+# ---------- TIMING ----------
+MIN_SAMPLE_SECONDS = 0.05
+NOISE_FLOOR_US = 1.0
+
+
+def _passes(fn, items) -> float:
+    # Like timeit: a collection landing in one sample is noise, not signal
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def time_per_call(fn, items, repeat: int) -> float:
+    """
+    Fastest seconds per call of fn(item) over `repeat` samples, each
+    looping over items enough times to last MIN_SAMPLE_SECONDS.
+    """
+    items = list(items)
+    loops = 1
+    while True:
+        elapsed = sum(_passes(fn, items) for _ in range(loops))
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            break
+        loops *= 2
+    runs = [elapsed / loops]
+    for _ in range(repeat - 1):
+        runs.append(sum(_passes(fn, items) for _ in range(loops)) / loops)
+    return min(runs) / len(items)
+
+
+def bench_analyzers(corpus_size: int, repeat: int) -> dict:
+    # No analysis cache: measure the analyzers themselves
+    agent = HealthCoachAgent(cache_size=0)
+    analyzers = {
+        "detect_mood": agent.detect_mood,
+        "detect_urgency": agent.detect_urgency,
+        "extract_keywords": agent.extract_keywords,
+        "philosophical_sentiment_heuristic": agent.philosophical_sentiment_heuristic,
+    }
+
+    lexicon = agent.resources.lexicon
+
+    results = {}
+    for length in MESSAGE_LENGTHS:
+        for mix in MOOD_MIXES:
+            corpus = make_corpus(corpus_size, length, mix)
+            results[f"features/{length}/{mix}"] = time_per_call(
+                lambda text: TextFeatures(text, lexicon), corpus, repeat
+            )
+            # Analyzers get prebuilt features, so they time only themselves
+            features = [TextFeatures(text, lexicon) for text in corpus]
+            for name, fn in analyzers.items():
+                results[f"{name}/{length}/{mix}"] = time_per_call(fn, features, repeat)
+    return results
+
+
+def bench_conversations(turn_counts, repeat: int) -> dict:
+    results = {}
+    for turns in turn_counts:
+        corpus = make_corpus(min(turns, 5000), "medium", "balanced", seed=turns)
+        messages = [corpus[i % len(corpus)] for i in range(turns)]
+
+        # Each sample replays the conversation on a fresh agent with fresh
+        # resources: the process-wide analysis cache would carry over
+        # whatever earlier runs left in it
+        runs = []
+        for _ in range(repeat):
+            agent = HealthCoachAgent(seed=0, resources=AnalyzerResources())
+            runs.append(_passes(agent.reply, messages))
+        results[f"reply/{turns}_turns"] = min(runs) / turns
+
+        results[f"generate_report/{turns}_turns"] = time_per_call(
+            lambda _: agent.generate_report(), range(10), repeat
+        )
+    return results
+
+
+def run_all(quick: bool = False, corpus_size: int = 300, repeat: int = 5) -> dict:
+    turn_counts = (10, 1_000) if quick else (10, 1_000, 100_000)
+    results = {}
+    results.update(bench_analyzers(corpus_size, repeat))
+    results.update(bench_conversations(turn_counts, repeat))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "unit": "seconds per call",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+# ---------- BASELINE COMPARISON ----------
+def compare(current: dict, baseline: dict, threshold: float,
+            noise_floor: float = NOISE_FLOOR_US * 1e-6) -> list:
+    """
+    Names of benchmarks slower than threshold x baseline (and by more than
+    noise_floor seconds), with ratios.
+    """
+    regressions = []
+    for name, seconds in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratio = seconds / base
+        if ratio > threshold and seconds - base > noise_floor:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_agent")
+    parser.add_argument("--save", help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="max allowed slowdown ratio vs baseline (default 1.25)")
+    parser.add_argument("--noise-floor", type=float, default=NOISE_FLOOR_US,
+                        help="ignore slowdowns smaller than this many µs per call "
+                             f"(default {NOISE_FLOOR_US})")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-turn conversation")
+    parser.add_argument("--corpus-size", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    current = run_all(args.quick, args.corpus_size, args.repeat)
+
+    for name, seconds in current["results"].items():
+        print(f"{name:<60} {seconds * 1e6:10.1f} µs")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nbaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.noise_floor * 1e-6)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}x baseline:")
+            for name, ratio in regressions:
+                print(f"  {name}: {ratio:.2f}x")
+            return 1
+        print(f"\nno regressions over {args.threshold}x baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
+import atexit
+import os
+import uuid
+
 import streamlit as st
 from agent.coach_agent import HealthCoachAgent
-import time
+from agent.resources import get_shared_resources
+from agent.storage import ConversationStore
 
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
@@ -52,15 +57,49 @@ st.markdown(
 st.divider()
 
 # ---------------- SESSION STATE ----------------
-if "agent" not in st.session_state:
-    st.session_state.agent = HealthCoachAgent()
+@st.cache_resource
+def get_conversation_store():
+    # One durable store per process, shared by every session; closing it
+    # at exit flushes turns still buffered for the background writer
+    store = ConversationStore(os.environ.get("COACH_DB_PATH", "coach_conversations.db"))
+    atexit.register(store.close)
+    return store
+
+
+@st.cache_resource
+def get_analyzer_resources():
+    # Compiled patterns, lexicons, templates and the analysis cache are
+    # read-only, so one copy serves every session
+    return get_shared_resources()
 
+
+if "agent" not in st.session_state:
+    # The session id lives in the URL, so a reload or redeploy resumes the
+    # same conversation context
+    session_id = st.query_params.get("sid")
+    if session_id:
+        st.session_state.agent = HealthCoachAgent.resume(
+            get_conversation_store(), session_id, resources=get_analyzer_resources()
+        )
+    else:
+        # A fresh id has nothing stored yet; resuming would only force a
+        # flush of every session's buffered turns to find that out
+        session_id = uuid.uuid4().hex
+        st.query_params["sid"] = session_id
+        st.session_state.agent = HealthCoachAgent(
+            store=get_conversation_store(), session_id=session_id,
+            resources=get_analyzer_resources(),
+        )
+
+# User turns are stored once, in the agent's memory; the history keeps
+# only their turn index (coach replies are stored as text)
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
 # ---------------- CHAT DISPLAY ----------------
 for speaker, msg in st.session_state.chat_history:
     if speaker == "You":
+        msg = st.session_state.agent.memory.text(msg)
         st.markdown(f"<div class='user-msg'><b>You:</b> {msg}</div>", unsafe_allow_html=True)
     else:
         st.markdown(f"<div class='agent-msg'><b>Coach:</b> {msg}</div>", unsafe_allow_html=True)
@@ -69,12 +108,12 @@ for speaker, msg in st.session_state.chat_history:
 user_input = st.chat_input("Type here... I’m listening 💗")
 
 if user_input:
-    # show typing effect
-    with st.spinner("Coach is thinking..."):
-        time.sleep(0.6)
-        reply = st.session_state.agent.reply(user_input)
+    st.markdown(f"<div class='user-msg'><b>You:</b> {user_input}</div>", unsafe_allow_html=True)
+
+    # stream the reply piece by piece as the coach puts it together
+    reply = st.write_stream(st.session_state.agent.reply_stream(user_input))
 
-    st.session_state.chat_history.append(("You", user_input))
+    st.session_state.chat_history.append(("You", len(st.session_state.agent.memory) - 1))
     st.session_state.chat_history.append(("Coach", reply))
     st.rerun()
 
@@ -108,10 +147,12 @@ st.divider()
 # ---------------- CHAT STATS ----------------
 st.markdown("### 📊 Conversation Insights")
 
-total_msgs = len(st.session_state.agent.memory)
-sad = sum(1 for m in st.session_state.agent.memory if m["mood"] == "sad")
-stress = sum(1 for m in st.session_state.agent.memory if m["mood"] == "stress")
-healthy = sum(1 for m in st.session_state.agent.memory if m["mood"] == "healthy")
+# Running counters on the agent: O(1) per rerun, whatever the history length
+total_msgs = st.session_state.agent.turn_count()
+mood_counts = st.session_state.agent.mood_counts()
+sad = mood_counts["sad"]
+stress = mood_counts["stress"]
+healthy = mood_counts["happy"]
 
 c1, c2, c3, c4 = st.columns(4)
 
@@ -3,6 +3,11 @@
 import streamlit as st
 from datetime import datetime
 
+from agent.assessment import DURATION_OPTIONS, AssessmentState
+from agent.documents import get_document_ingestor
+from agent.history import HistorySummarizer
+from agent.knowledge_base import get_symptom_engine
+
 st.set_page_config(
     page_title="AI Health Diagnosis",
     page_icon="🩺",
@@ -25,8 +30,25 @@ st.markdown(
 if "stage" not in st.session_state:
     st.session_state.stage = 1
 
-if "followup_count" not in st.session_state:
-    st.session_state.followup_count = 0
+if "followup_answers" not in st.session_state:
+    st.session_state.followup_answers = ()
+
+# upload file_id -> (file name, IngestJob); extraction runs in the background
+if "documents" not in st.session_state:
+    st.session_state.documents = {}
+
+# Structured profile from the history box and documents, fed incrementally
+if "history" not in st.session_state:
+    st.session_state.history = HistorySummarizer()
+    st.session_state.history_text = ""
+    st.session_state.pages_summarized = {}  # document digest -> pages fed
+
+# Incremental assessment for the current (symptoms, profile version)
+if "assessment" not in st.session_state:
+    st.session_state.assessment = None
+    st.session_state.assessment_key = None
+
+DOCUMENT_POLL_SECONDS = 1.0
 
 # -------------------- SIDEBAR --------------------
 with st.sidebar:
@@ -43,69 +65,95 @@ with st.sidebar:
     )
 
 # -------------------- DEMO AI ENGINE --------------------
-def demo_ai(symptoms, followups=0):
-    s = symptoms.lower()
-
-    if "chest pain" in s:
-        return {
-            "condition": "⚠️ Possible cardiac or muscular issue",
-            "questions": [
-                "Is the pain sharp, dull, or crushing?",
-                "Does it spread to arm, jaw, or back?",
-                "Do you feel breathless or sweaty?"
-            ],
-            "risk": "high",
-            "advice": [
-                "Avoid exertion immediately",
-                "Seek urgent medical evaluation"
-            ]
-        }
+@st.cache_resource
+def load_symptom_engine():
+    # Memory-mapped condition catalog, loaded on first use and shared by
+    # every session in the process
+    return get_symptom_engine()
+
+
+@st.cache_resource
+def load_document_ingestor():
+    # One extraction pool and content-hash cache for every session
+    return get_document_ingestor()
+
+
+def update_history(history_text=None):
+    """Feed the summarizer only what is new since the last rerun."""
+    history = st.session_state.history
+
+    if history_text is not None and history_text != st.session_state.history_text:
+        # Edited text: re-summarize just this source
+        history.reset("history")
+        history.feed("history", history_text)
+        st.session_state.history_text = history_text
+
+    fed = st.session_state.pages_summarized
+    jobs = {job.digest: job for _, job in st.session_state.documents.values()}
+    for digest in [d for d in fed if d not in jobs]:
+        history.reset(digest)
+        del fed[digest]
+    for digest, job in jobs.items():
+        count, finished = fed.get(digest, (0, False))
+        if finished:
+            continue
+        done = job.done
+        new_pages = job.pages(count)
+        if new_pages or done:
+            history.feed(digest, "".join(p + "\n" for p in new_pages), final=done)
+        fed[digest] = (count + len(new_pages), done)
+
+
+def documents_pending():
+    return any(not job.done for _, job in st.session_state.documents.values())
+
+
+def poll_interval():
+    """Fragments rerun on their own only while documents are being read."""
+    return DOCUMENT_POLL_SECONDS if documents_pending() else None
+
+
+def show_document_status():
+    for name, job in st.session_state.documents.values():
+        done, total = job.progress()
+        if job.status in ("pending", "running"):
+            st.caption(f"📄 {name}: reading… {done}/{total or '?'} pages")
+        elif job.status == "done":
+            note = f" (first {total} pages)" if job.truncated else ""
+            st.caption(f"📄 {name}: {done} page(s) read{note}")
+        else:
+            st.caption(f"📄 {name}: not read — {job.error}")
 
-    if "fever" in s and "cough" in s:
-        return {
-            "condition": "Possible respiratory or viral infection",
-            "questions": [
-                "Is the cough dry or with mucus?",
-                "Do you have shortness of breath?",
-                "Is fever persistent despite medication?"
-            ],
-            "risk": "medium",
-            "advice": [
-                "Rest and hydrate well",
-                "Monitor temperature twice daily",
-                "Consult a doctor if fever lasts >3 days"
-            ]
-        }
 
-    if "headache" in s and ("stress" in s or "tension" in s):
-        return {
-            "condition": "Likely tension or stress-related headache",
-            "questions": [
-                "Do you have long screen exposure?",
-                "Is sleep disturbed?",
-                "Any nausea or vision issues?"
-            ],
-            "risk": "low",
-            "advice": [
-                "Improve sleep routine",
-                "Limit screen exposure",
-                "Practice relaxation exercises"
-            ]
-        }
+def finish_polling(polling):
+    # Once the last document is read, one full rerun stops the timers
+    if polling and not documents_pending():
+        st.rerun()
 
-    return {
-        "condition": "Symptoms unclear — more information needed",
-        "questions": [
-            "When did the symptoms begin?",
-            "Are they worsening or improving?",
-            "Any recent illness, travel, or injury?"
-        ],
-        "risk": "unknown",
-        "advice": [
-            "Track symptoms carefully",
-            "Consult a healthcare professional"
-        ]
-    }
+
+def get_assessment(symptoms, answers=(), duration=None, severity=None):
+    """
+    The session's AssessmentState, built once per (symptoms, history
+    profile). Only rules whose terms appear in the symptoms are
+    evaluated, high-risk rules first. Answers, duration and severity are applied incrementally
+    (unchanged ones are no-ops) and the result stays cached in the state
+    between reruns. Document pages are summarized into the profile as
+    background extraction produces them.
+    """
+    update_history()
+    history = st.session_state.history
+    key = (symptoms, history.version)
+    state = st.session_state.assessment
+    if state is None or st.session_state.assessment_key != key:
+        state = AssessmentState(load_symptom_engine(), symptoms, history.profile())
+        st.session_state.assessment = state
+        st.session_state.assessment_key = key
+
+    state.set_duration(duration)
+    state.set_severity(severity)
+    for question, answer in answers:
+        state.answer(question, answer)
+    return state
 
 # -------------------- STEP 1: MEDICAL HISTORY --------------------
 if st.session_state.stage == 1:
@@ -127,9 +175,33 @@ if st.session_state.stage == 1:
             accept_multiple_files=True
         )
 
+        # Extraction starts on upload and continues while the user moves on
+        ingestor = load_document_ingestor()
+        known = st.session_state.documents
+        st.session_state.documents = {
+            doc.file_id: known.get(doc.file_id) or (doc.name, ingestor.submit(doc.getvalue()))
+            for doc in uploaded_docs or ()
+        }
+
         if uploaded_docs:
             st.success(f"{len(uploaded_docs)} document(s) uploaded")
 
+    update_history(medical_history)
+
+    interval = poll_interval()
+
+    @st.fragment(run_every=interval)
+    def document_progress(polling):
+        update_history()
+        show_document_status()
+        summary = st.session_state.history.summary()
+        if summary:
+            with st.expander("🗂️ History summary"):
+                st.text(summary)
+        finish_polling(polling)
+
+    document_progress(interval is not None)
+
     consent = st.checkbox(
         "I understand this is not a medical diagnosis and agree to proceed"
     )
@@ -153,7 +225,7 @@ elif st.session_state.stage == 2:
 
     duration = st.selectbox(
         "How long have you had these symptoms?",
-        ["Less than 24 hours", "1–3 days", "4–7 days", "More than a week"]
+        DURATION_OPTIONS
     )
 
     severity = st.slider(
@@ -166,6 +238,8 @@ elif st.session_state.stage == 2:
             st.warning("Please describe your symptoms.")
         else:
             st.session_state.symptoms = symptoms
+            st.session_state.duration = duration
+            st.session_state.severity = severity
             st.session_state.stage = 3
             st.rerun()
 
@@ -173,13 +247,35 @@ elif st.session_state.stage == 2:
 elif st.session_state.stage == 3:
     st.subheader("3️⃣ AI Follow-up Assessment")
 
-    result = demo_ai(st.session_state.symptoms, st.session_state.followup_count)
+    interval = poll_interval()
+
+    @st.fragment(run_every=interval)
+    def live_assessment(polling):
+        # Built once; reruns (from the inputs or the document timer) only
+        # apply what changed, and each changed answer rescores only the
+        # conditions it touches
+        state = get_assessment(
+            st.session_state.symptoms, (),
+            st.session_state.duration, st.session_state.severity,
+        )
+        answers = tuple((q, st.session_state.get(q, "")) for q in state.questions)
+        for q, answer in answers:
+            state.answer(q, answer)
+        # Widget values are dropped once stage 3 stops rendering them
+        st.session_state.followup_answers = answers
+
+        st.markdown("### 🔍 Assessment")
+        st.info(state.result()["condition"])
+
+        if documents_pending():
+            st.caption("Uploaded documents are still being read; the assessment updates as pages arrive.")
+            show_document_status()
+        finish_polling(polling)
 
-    st.markdown("### 🔍 Initial Assessment")
-    st.info(result["condition"])
+    live_assessment(interval is not None)
 
     st.markdown("### ❓ Follow-up Questions")
-    for q in result["questions"]:
+    for q in st.session_state.assessment.questions:
         st.text_input(q, key=q)
 
     if st.button("➡️ Generate Guidance"):
@@ -190,26 +286,43 @@ elif st.session_state.stage == 3:
 elif st.session_state.stage == 4:
     st.subheader("4️⃣ Guidance & Next Steps")
 
-    result = demo_ai(st.session_state.symptoms)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("### 🧠 Possible Condition")
-        st.success(result["condition"])
-
-        st.markdown("### 🚦 Risk Level")
-        if result["risk"] == "high":
-            st.error("HIGH — Seek medical attention immediately")
-        elif result["risk"] == "medium":
-            st.warning("MODERATE — Monitor closely")
-        else:
-            st.info("LOW / UNCLEAR")
-
-    with col2:
-        st.markdown("### 🧘 Recommended Actions")
-        for a in result["advice"]:
-            st.write("•", a)
+    interval = poll_interval()
+
+    @st.fragment(run_every=interval)
+    def guidance(polling):
+        # Pages that arrive after this stage is reached still update it
+        result = get_assessment(
+            st.session_state.symptoms,
+            st.session_state.followup_answers,
+            st.session_state.duration,
+            st.session_state.severity,
+        ).result()
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("### 🧠 Possible Condition")
+            st.success(result["condition"])
+
+            st.markdown("### 🚦 Risk Level")
+            if result["risk"] == "high":
+                st.error("HIGH — Seek medical attention immediately")
+            elif result["risk"] == "medium":
+                st.warning("MODERATE — Monitor closely")
+            else:
+                st.info("LOW / UNCLEAR")
+
+        with col2:
+            st.markdown("### 🧘 Recommended Actions")
+            for a in result["advice"]:
+                st.write("•", a)
+
+        if documents_pending():
+            st.caption("Uploaded documents are still being read; guidance updates as pages arrive.")
+            show_document_status()
+        finish_polling(polling)
+
+    guidance(interval is not None)
 
     st.markdown("---")
     st.caption(